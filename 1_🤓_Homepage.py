@@ -30,6 +30,7 @@ def login(username, password):
         if token:
             st.session_state.authenticated = True
             st.session_state.token = token
+            st.session_state.username = username
             st.success("Login successful!")
         else:
             st.error("Invalid username or password")
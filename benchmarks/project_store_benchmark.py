@@ -0,0 +1,128 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+# Run from anywhere: the app's modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_store import PRIORITIES, SQLiteProjectStore, created_month, projects_from_templates
+from project_templates import CREDIT_TEMPLATES
+
+
+# Function to time `fn`, print the total and per-operation cost, and return its result
+def timed(label, fn, operations=1):
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    print(f"{label:<40} {seconds * 1e3:10.1f} ms {seconds / operations * 1e6:12.1f} us/op")
+    return result
+
+
+# Function to seed `count` projects for `owner` from the credit templates in one transaction
+def seed(store, owner, count):
+    templates = [CREDIT_TEMPLATES[index % len(CREDIT_TEMPLATES)] for index in range(count)]
+    return store.add_many(owner, projects_from_templates(templates))
+
+
+# Function to apply `operations` random ticks, edits, priority changes,
+# creates and deletes to an owner's projects
+def random_operations(store, owner, operations, rng):
+    ids = [project.id for project in store.load(owner)]
+    for index in range(operations):
+        choice = rng.random()
+        if choice < 0.05 or not ids:
+            ids.append(store.create_project(owner, f"Project {index}", ["a", "b", "c"][:rng.randint(0, 3)]).id)
+            continue
+        base = store.get(owner, rng.choice(ids))
+        if choice < 0.1:
+            store.delete_project(owner, base.id, base.version)
+            ids.remove(base.id)
+        elif choice < 0.7 and base.steps:
+            store.set_step(owner, base, rng.randrange(len(base.steps)), rng.random() < 0.6)
+        elif choice < 0.85:
+            steps = list(base.steps)
+            if steps and rng.random() < 0.5:
+                steps[rng.randrange(len(steps))] = f"Edited {index}"
+            else:
+                steps = list(rng.choice(CREDIT_TEMPLATES).steps)[:rng.randint(0, 10)]
+            store.edit_project(owner, base, base.title, steps)
+        else:
+            store.set_priority(owner, base, rng.choice(PRIORITIES))
+
+
+# Function to compare an owner's maintained counters with a recount from the
+# projects themselves; returns a list of mismatches, empty when they agree
+def recount_mismatches(store, owner):
+    expected = Counter()
+    for project in store.load(owner):
+        key = (project.priority, created_month(project.created))
+        expected[key + ("projects",)] += 1
+        expected[key + ("steps",)] += len(project.steps)
+        expected[key + ("completed",)] += sum(project.completed)
+    maintained = Counter()
+    for row in store.progress(owner):
+        key = (row.priority, row.created_month)
+        maintained[key + ("projects",)] += row.projects
+        maintained[key + ("steps",)] += row.steps
+        maintained[key + ("completed",)] += row.completed
+    return [
+        (key, maintained[key], expected[key])
+        for key in sorted(set(expected) | set(maintained)) if maintained[key] != expected[key]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the project store: creates, toggles and listing.")
+    parser.add_argument("--projects", type=int, default=10_000, help="projects seeded for the benchmark owner")
+    parser.add_argument("--operations", type=int, default=1_000, help="creates, toggles and random operations timed")
+    parser.add_argument("--page-size", type=int, default=25)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteProjectStore(os.path.join(directory, "benchmark.db"))
+        owner = "benchmark"
+        print(f"{args.projects} projects, {args.operations} operations")
+
+        # Creates
+        timed("create_project", lambda: [
+            store.create_project("creates", f"Project {index}", ["a", "b", "c"]) for index in range(args.operations)
+        ], args.operations)
+        projects = timed(f"add_many ({args.projects} from templates)", lambda: seed(store, owner, args.projects), args.projects)
+
+        # Toggles, each from the displayed version like the pages do
+        sample = random.Random(args.seed).sample(projects, min(args.operations, len(projects)))
+        timed("set_step", lambda: [store.set_step(owner, project, 0, True) for project in sample], len(sample))
+
+        # Listing
+        last_offset = max(args.projects - args.page_size, 0)
+        timed("count", lambda: [store.count(owner) for _ in range(args.operations)], args.operations)
+        timed("summaries, first page", lambda: [
+            store.summaries(owner, args.page_size) for _ in range(args.operations)
+        ], args.operations)
+        timed("summaries, last page", lambda: [
+            store.summaries(owner, args.page_size, last_offset) for _ in range(100)
+        ], 100)
+        timed("progress", lambda: [store.progress(owner) for _ in range(args.operations)], args.operations)
+        timed("load", lambda: store.load(owner))
+        timed("cached_load, miss", lambda: store.cached_load(owner))
+        timed("cached_load, hit", lambda: [store.cached_load(owner) for _ in range(args.operations)], args.operations)
+
+        # Counters against a recount after random operations
+        timed("random operations", lambda: random_operations(
+            store, owner, args.operations, random.Random(args.seed)
+        ), args.operations)
+        mismatches = recount_mismatches(store, owner)
+        if mismatches:
+            for key, maintained, expected in mismatches:
+                print(f"counter mismatch {key}: maintained {maintained}, recounted {expected}")
+            sys.exit(1)
+        print("counters match a recount")
+
+
+if __name__ == "__main__":
+    main()
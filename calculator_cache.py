@@ -0,0 +1,165 @@
+import inspect
+import sys
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+from calculators import (
+    calculate_credit_card_schedule,
+    calculate_minimum_payment,
+    calculate_amortization_schedule,
+)
+from exports import export_download
+from calculator_charts import render_credit_card_chart, render_amortization_chart
+
+# Default memory budget for cached calculator results, shared by every session
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+# Function to estimate how many bytes a cached value holds
+def estimate_size(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    if hasattr(value, "to_json"):
+        # Plotly figures: the serialized spec is what gets held and shipped
+        return len(value.to_json())
+    return sys.getsizeof(value)
+
+
+# Least-recently-used cache bounded by the total estimated size of its values.
+# Safe to share across Streamlit sessions, which run on separate threads.
+class LRUCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key][0]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+calculator_cache = LRUCache()
+
+
+# Function to normalize calculator inputs so equal amounts share a cache key
+def normalize_input(value):
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        # Round away float noise from widget arithmetic; 1e-6 is far below a cent or a basis point
+        return round(float(value), 6) + 0.0
+    return value
+
+
+# Decorator to memoize a calculator function in `calculator_cache`
+def memoize(func):
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (func.__name__,) + tuple(normalize_input(arg) for arg in bound.arguments.values())
+        found, value = calculator_cache.get(key)
+        if not found:
+            value = func(*args, **kwargs)
+            calculator_cache.put(key, value)
+        return value
+    return wrapper
+
+
+@memoize
+def credit_card_schedule(balance, annual_rate, months):
+    return calculate_credit_card_schedule(balance, annual_rate, months)
+
+
+@memoize
+def credit_card_csv(balance, annual_rate, months):
+    schedule_df, _, _ = credit_card_schedule(balance, annual_rate, months)
+    return export_download(schedule_df, 'credit_card_payment_schedule')["data"]
+
+
+@memoize
+def credit_card_chart(balance, annual_rate, months):
+    schedule_df, _, _ = credit_card_schedule(balance, annual_rate, months)
+    return render_credit_card_chart(schedule_df)
+
+
+@memoize
+def amortization_schedule(principal, annual_rate, months, down_payment):
+    return calculate_amortization_schedule(principal, annual_rate, months, down_payment)
+
+
+@memoize
+def amortization_csv(principal, annual_rate, months, down_payment):
+    schedule_df = amortization_schedule(principal, annual_rate, months, down_payment)
+    return export_download(schedule_df, 'amortization_schedule')["data"]
+
+
+@memoize
+def amortization_chart(principal, annual_rate, months, down_payment):
+    schedule_df = amortization_schedule(principal, annual_rate, months, down_payment)
+    return render_amortization_chart(schedule_df)
+
+
+@memoize
+def minimum_payment(balance, annual_rate, minimum_percentage, percent_of_balance=False, minimum_floor=0.0):
+    return calculate_minimum_payment(balance, annual_rate, minimum_percentage, percent_of_balance, minimum_floor)
+
+
+# Function to report hit/miss counters for the calculator cache
+def cache_stats():
+    return calculator_cache.stats()
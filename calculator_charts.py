@@ -0,0 +1,55 @@
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+# Most points plotted per line; longer schedules are evenly thinned to this many
+MAX_CHART_POINTS = 240
+
+
+# Function to thin a schedule to at most `max_points` evenly spaced months,
+# always keeping the first and last month
+def downsample_schedule(schedule_df, max_points=MAX_CHART_POINTS):
+    if len(schedule_df) <= max_points:
+        return schedule_df
+    positions = np.unique(np.linspace(0, len(schedule_df) - 1, max_points).round().astype(int))
+    return schedule_df.iloc[positions]
+
+
+# Function to build a two-row line chart from (column, label, color) traces per row
+def schedule_figure(schedule_df, top_traces, bottom_traces, titles, y_titles, height):
+    points = downsample_schedule(schedule_df)
+    fig = make_subplots(rows=2, cols=1, subplot_titles=titles, vertical_spacing=0.12)
+    for row, traces in ((1, top_traces), (2, bottom_traces)):
+        for column, label, color in traces:
+            fig.add_trace(
+                go.Scatter(x=points["Month"], y=points[column], name=label, mode="lines", line=dict(color=color)),
+                row=row, col=1,
+            )
+        fig.update_xaxes(title_text="Month", row=row, col=1)
+        fig.update_yaxes(title_text=y_titles[row - 1], row=row, col=1)
+    fig.update_layout(height=height, margin=dict(t=60, b=40))
+    return fig
+
+
+# Function to chart the credit card payment breakdown
+def render_credit_card_chart(schedule_df):
+    return schedule_figure(
+        schedule_df,
+        [("Principal Payment", "Principal Payment", "blue"), ("Interest Payment", "Interest Payment", "red")],
+        [("Remaining Balance", "Remaining Balance", "green"), ("Cumulative Interest", "Cumulative Interest", "orange")],
+        ("Principal and Interest Payment Breakdown", "Remaining Balance and Cumulative Interest Over Time"),
+        ("Payment ($)", "Amount ($)"),
+        height=800,
+    )
+
+
+# Function to chart the amortization breakdown
+def render_amortization_chart(schedule_df):
+    return schedule_figure(
+        schedule_df,
+        [("Principal Payment", "Principal Payment", "blue"), ("Interest Payment", "Interest Payment", "red")],
+        [("Remaining Balance", "Remaining Balance", "green")],
+        ("Principal and Interest Payment Breakdown", "Remaining Balance Over Time"),
+        ("Payment ($)", "Remaining Balance ($)"),
+        height=650,
+    )
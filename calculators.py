@@ -0,0 +1,232 @@
+import logging
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Column layout shared by every schedule the calculators produce
+SCHEDULE_COLUMNS = [
+    "Month",
+    "Payment",
+    "Principal Payment",
+    "Interest Payment",
+    "Cumulative Interest",
+    "Cumulative Principal",
+    "Remaining Balance",
+]
+
+
+# Function to calculate the level monthly payment that retires a balance in `months`.
+# Works on scalars or arrays; a zero rate amortizes linearly.
+def level_payment(balance, monthly_rate, months):
+    balance, monthly_rate, months = np.broadcast_arrays(
+        np.asarray(balance, dtype=float), np.asarray(monthly_rate, dtype=float), np.asarray(months, dtype=float)
+    )
+    zero_rate = monthly_rate == 0
+    safe_rate = np.where(zero_rate, 1.0, monthly_rate)
+    safe_months = np.where(months > 0, months, 1.0)
+    # -expm1(-n * log1p(r)) is 1 - (1 + r)^-n without cancellation for small rates
+    annuity = balance * safe_rate / -np.expm1(-safe_months * np.log1p(safe_rate))
+    return np.where(zero_rate, balance / safe_months, annuity)
+
+
+# Function to build the schedule grid for one or many loans from the closed-form
+# annuity formula. Rows are loans, columns are months 1..max(months); every
+# column is computed as a whole array: the balance after month k is
+# B * (1 + r)^k - P * ((1 + r)^k - 1) / r, and the cumulative columns follow
+# from it without a running sum. Months past a loan's term are masked out.
+def amortization_grid(balance, annual_rate, months):
+    balance = np.atleast_1d(np.asarray(balance, dtype=float))
+    monthly_rate = np.atleast_1d(np.asarray(annual_rate, dtype=float)) / 100 / 12
+    months = np.atleast_1d(np.asarray(months, dtype=np.int64))
+    balance, monthly_rate, months = np.broadcast_arrays(balance, monthly_rate, months)
+    months = np.where(balance > 0, np.maximum(months, 0), 0)
+
+    payment = level_payment(balance, monthly_rate, months)
+    month = np.arange(1, int(months.max(initial=0)) + 1)
+    zero_rate = (monthly_rate == 0)[:, None]
+    safe_rate = np.where(zero_rate, 1.0, monthly_rate[:, None])
+    # expm1/log1p keep (1 + r)^k - 1 accurate for small rates and long terms
+    growth_less_one = np.expm1(np.log1p(safe_rate) * month)
+    accrued = np.where(zero_rate, month, growth_less_one / safe_rate)
+    growth = np.where(zero_rate, 1.0, 1 + growth_less_one)
+    remaining = balance[:, None] * growth - payment[:, None] * accrued
+
+    opening = np.empty_like(remaining)
+    opening[:, :1] = balance[:, None]
+    opening[:, 1:] = remaining[:, :-1]
+    interest = opening * monthly_rate[:, None]
+    cumulative_principal = balance[:, None] - remaining
+
+    grid = {
+        "Month": np.broadcast_to(month, remaining.shape),
+        "Payment": np.broadcast_to(payment[:, None], remaining.shape),
+        "Principal Payment": payment[:, None] - interest,
+        "Interest Payment": interest,
+        "Cumulative Interest": payment[:, None] * month - cumulative_principal,
+        "Cumulative Principal": cumulative_principal,
+        "Remaining Balance": np.maximum(remaining, 0),
+    }
+    active = month <= months[:, None]
+    return grid, active, payment, months
+
+
+# Function to build a single-loan schedule DataFrame from the closed-form engine
+def schedule_frame(balance, annual_rate, months):
+    grid, active, payment, months = amortization_grid(balance, annual_rate, months)
+    term = int(months[0])
+    df_schedule = pd.DataFrame({column: grid[column][0, :term] for column in SCHEDULE_COLUMNS})
+    return df_schedule, float(payment[0]) if term else 0.0
+
+
+# Function to amortize a whole book of loans at once. `loans` is a DataFrame (or
+# a dict of equal-length arrays) with "Principal", "Annual Rate" and "Months"
+# columns and optional "Down Payment" and "Loan ID" columns. Returns a
+# long-format schedule with a leading "Loan ID" column plus one row of totals
+# per loan.
+def calculate_portfolio_schedule(loans):
+    logger.info("Calculating portfolio amortization schedule")
+    loans = pd.DataFrame(loans)
+    loan_ids = loans["Loan ID"].to_numpy() if "Loan ID" in loans else loans.index.to_numpy()
+    principal = loans["Principal"].to_numpy(dtype=float)
+    down_payment = loans["Down Payment"].to_numpy(dtype=float) if "Down Payment" in loans else 0.0
+    loan_amount = principal - down_payment
+
+    grid, active, payment, months = amortization_grid(
+        loan_amount, loans["Annual Rate"].to_numpy(dtype=float), loans["Months"].to_numpy()
+    )
+    schedule = {"Loan ID": np.repeat(loan_ids, months)}
+    for column in SCHEDULE_COLUMNS:
+        schedule[column] = grid[column][active]
+    df_schedule = pd.DataFrame(schedule)
+
+    total_payment = np.where(months > 0, payment * months, 0.0)
+    df_totals = pd.DataFrame({
+        "Loan ID": loan_ids,
+        "Loan Amount": np.maximum(loan_amount, 0),
+        "Months": months,
+        "Monthly Payment": np.where(months > 0, payment, 0.0),
+        "Total Payment": total_payment,
+        "Total Interest": np.where(months > 0, total_payment - loan_amount, 0.0),
+    })
+    return df_schedule, df_totals
+
+
+# Function to calculate total amount payable for a credit card
+def calculate_total_payment(balance, annual_rate, months):
+    logger.info("Calculating total payment for credit card")
+    monthly_rate = annual_rate / 100 / 12
+    total_payment = balance * (1 + monthly_rate) ** months
+    return total_payment
+
+
+# Function to calculate the full payment schedule for a credit card
+def calculate_credit_card_schedule(balance, annual_rate, months):
+    logger.info("Calculating credit card payment schedule")
+    df_schedule, monthly_payment = schedule_frame(balance, annual_rate, months)
+    total_payment = monthly_payment * len(df_schedule)
+    total_interest = total_payment - balance if len(df_schedule) else 0.0
+    return df_schedule, total_payment, total_interest
+
+
+# Function to solve for the number of months a fixed payment takes to retire a
+# balance. Closed form: n = -log(1 - r * B / P) / log(1 + r). Works on arrays;
+# returns inf where the payment does not cover the monthly interest.
+def payoff_months(balance, annual_rate, payment):
+    balance = np.asarray(balance, dtype=float)
+    monthly_rate = np.asarray(annual_rate, dtype=float) / 100 / 12
+    payment = np.asarray(payment, dtype=float)
+    amortizing = (payment > balance * monthly_rate) & (payment > 0)
+    safe_payment = np.where(amortizing, payment, 1.0)
+    safe_rate = np.where(monthly_rate == 0, 1.0, monthly_rate)
+    exact = np.where(
+        monthly_rate == 0,
+        balance / safe_payment,
+        -np.log1p(-np.minimum(safe_rate * balance / safe_payment, 1.0 - 1e-16)) / np.log1p(safe_rate),
+    )
+    # Snap values within float noise of a whole month so e.g. 12.0000000001 is 12
+    months = np.ceil(exact - 1e-9)
+    return np.where(balance <= 0, 0.0, np.where(amortizing, months, np.inf))
+
+
+# Function to calculate what remains after `months` fixed payments
+def balance_after(balance, annual_rate, payment, months):
+    monthly_rate = annual_rate / 100 / 12
+    if monthly_rate == 0:
+        return balance - payment * months
+    growth_less_one = np.expm1(months * np.log1p(monthly_rate))
+    return balance * (1 + growth_less_one) - payment * growth_less_one / monthly_rate
+
+
+# Result of a minimum-payment payoff calculation. `pays_off` is False when the
+# payment never covers the interest; months and totals are then None.
+PayoffResult = namedtuple("PayoffResult", ["months", "total_payment", "total_interest", "pays_off"])
+
+NEVER_PAYS_OFF = PayoffResult(None, None, None, False)
+
+
+# Function to total a fixed-payment payoff: every month pays `payment` except
+# the last, which pays off whatever balance and interest remain.
+def fixed_payment_payoff(balance, annual_rate, payment):
+    months = float(payoff_months(balance, annual_rate, payment))
+    if not np.isfinite(months):
+        return NEVER_PAYS_OFF
+    months = int(months)
+    if months == 0:
+        return PayoffResult(0, 0.0, 0.0, True)
+    monthly_rate = annual_rate / 100 / 12
+    final_payment = balance_after(balance, annual_rate, payment, months - 1) * (1 + monthly_rate)
+    total_payment = float(payment * (months - 1) + final_payment)
+    return PayoffResult(months, total_payment, total_payment - balance, True)
+
+
+# Function to calculate minimum credit card payment.
+# By default the minimum is a fixed payment of `minimum_percentage` of the
+# starting balance. With `percent_of_balance=True` it is recomputed every month
+# as that percentage of the current balance, but never below `minimum_floor`:
+# the balance decays geometrically until the percentage drops under the floor,
+# then the floor is paid as a fixed payment.
+def calculate_minimum_payment(balance, annual_rate, minimum_percentage, percent_of_balance=False, minimum_floor=0.0):
+    logger.info("Calculating minimum payment for credit card")
+    percentage = minimum_percentage / 100
+    if not percent_of_balance:
+        return fixed_payment_payoff(balance, annual_rate, balance * percentage)
+
+    monthly_rate = annual_rate / 100 / 12
+    decay = 1 + monthly_rate - percentage
+    if minimum_floor <= 0 and decay > 0:
+        # A pure percentage shrinks the balance forever but never reaches zero
+        return NEVER_PAYS_OFF
+    if decay <= 0:
+        # The percentage covers the whole balance plus interest in one month
+        return fixed_payment_payoff(balance, annual_rate, balance * percentage)
+    if balance * percentage <= minimum_floor:
+        # The floor is the larger payment from the start and stays so as the balance falls
+        return fixed_payment_payoff(balance, annual_rate, minimum_floor)
+    if decay >= 1:
+        # The percentage never gets ahead of the interest, so the balance only grows
+        return NEVER_PAYS_OFF
+
+    # Months during which the percentage payment is still at or above the floor
+    threshold = minimum_floor / percentage
+    percent_months = int(np.floor(np.log(threshold / balance) / np.log(decay))) + 1
+    starting_balances = balance * decay ** np.arange(percent_months)
+    percent_paid = float(np.sum(starting_balances * percentage))
+    remaining = balance * decay ** percent_months
+
+    tail = fixed_payment_payoff(remaining, annual_rate, minimum_floor)
+    if not tail.pays_off:
+        return NEVER_PAYS_OFF
+    total_payment = percent_paid + tail.total_payment
+    return PayoffResult(percent_months + tail.months, total_payment, total_payment - balance, True)
+
+
+# Function to calculate amortization schedule with down payment
+def calculate_amortization_schedule(principal, annual_rate, months, down_payment):
+    logger.info("Calculating amortization schedule")
+    # Adjust principal for down payment
+    loan_amount = principal - down_payment
+    df_schedule, _ = schedule_frame(loan_amount, annual_rate, months)
+    return df_schedule
@@ -0,0 +1,514 @@
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from schema import CREDIT_CATEGORIES, CREDIT_DTYPES, check_categories, with_categories
+
+# Number of synthetic client profiles in the sample book, and the first one's id
+SAMPLE_CLIENT_COUNT = 25
+SAMPLE_CLIENT = "client-0000"
+
+# Clients whose history stays materialized after being viewed
+RECENT_CLIENT_CACHE_SIZE = 64
+
+# Edits splice new chunks into the sorted table; compact once it holds this many
+MAX_TABLE_CHUNKS = 256
+
+# Set to a directory to persist credit history as per-client Arrow/Parquet files
+CREDIT_STORE_PATH = os.environ.get("CREDIT_STORE_PATH")
+CREDIT_STORE_FORMAT = os.environ.get("CREDIT_STORE_FORMAT", "ipc")
+
+# Or set to a single Arrow IPC file holding every client's history, sorted by Client ID
+CREDIT_BOOK_PATH = os.environ.get("CREDIT_BOOK_PATH")
+
+# Columns each dashboard view reads from the history itself; None means every
+# column. Summary numbers come from the precomputed aggregates instead.
+VIEW_COLUMNS = {
+    "Credit Score Overview": ["Date", "Credit Score"],
+    "Credit Utilization": ["Date", "Credit Utilization"],
+    "Payment History": ["Date", "Payment History"],
+    "Credit Report Summary": [],
+    "Credit Inquiries": ["Date", "Credit Inquiries"],
+    "Credit Limits": ["Date", "Credit Limits"],
+    "Debt-to-Income Ratio": ["Date", "Debt-to-Income Ratio"],
+    "Loan and Credit Card Balances": ["Date", "Loan Balances"],
+    "Account Age": ["Date", "Account Age (Months)"],
+    "Monthly Payments": ["Date", "Monthly Payments"],
+    "Credit Accounts Breakdown": [],
+    "Top 5 Highest Balances": [],
+    "Top 5 Recent Transactions": [],
+    "Upcoming Payments": ["Date", "Upcoming Payments"],
+    "Credit Utilization by Account Type": [],
+    "Average Payment History": [],
+    "Credit Score Trend": ["Date", "Credit Score"],
+    "Monthly Spending Trend": ["Date", "Monthly Payments"],
+    "Credit Score vs. Credit Utilization": ["Credit Utilization", "Credit Score"],
+    "Debt Repayment Schedule": [],
+    "New Credit Accounts": ["Date", "New Credit Accounts"],
+    "Credit Score Impact Simulation": [],
+    "Debt Reduction Plan": [],
+    "Credit Score Improvement Tips": [],
+    "Alerts and Recommendations": [],
+    "Edit Credit Info": [
+        "Date", "Credit Score", "Credit Utilization", "Total Debt", "Income", "Monthly Payments",
+        "New Credit Accounts", "Credit Limits", "Payment History", "Debt-to-Income Ratio",
+    ],
+    "Export Data": None,
+}
+
+# Columns the precomputed aggregates are derived from
+AGGREGATE_COLUMNS = [
+    "Date", "Credit Score", "Credit Utilization", "Payment History", "Credit Report Summary",
+    "Credit Inquiries", "Debt-to-Income Ratio", "Loan Balances", "Recent Transactions",
+]
+
+_store_lock = threading.Lock()
+_credit_store = None
+_aggregate_lock = threading.Lock()
+_shared_aggregates = {}
+
+
+# Generate sample data
+def generate_sample_data(seed=42):
+    np.random.seed(seed)
+    dates = pd.date_range(start="2014-01-01", periods=120, freq=pd.offsets.MonthEnd())  # 10 years of monthly data
+
+    # Extended and diversified data
+    data = {
+        "Date": dates,
+        "Credit Score": np.random.randint(650, 850, size=120),
+        "Credit Utilization": np.random.uniform(0.2, 0.9, size=120),
+        "Total Debt": np.random.randint(1000, 20000, size=120),
+        "Monthly Payments": np.random.randint(100, 2000, size=120),
+        "Income": np.random.randint(3000, 10000, size=120),
+        "New Credit Accounts": np.random.randint(0, 5, size=120),
+        "Credit Limits": np.random.randint(5000, 50000, size=120),
+        "Payment History": np.random.choice(CREDIT_CATEGORIES["Payment History"], size=120, p=[0.85, 0.15]),
+        "Loan Balances": np.random.randint(1000, 20000, size=120),
+        "Account Age (Months)": np.random.randint(1, 180, size=120),
+        "Recent Transactions": np.random.randint(0, 20, size=120),
+        "Upcoming Payments": np.random.randint(50, 2000, size=120),
+        "Credit Inquiries": np.random.randint(0, 10, size=120),
+        "Credit Report Summary": np.random.choice(CREDIT_CATEGORIES["Credit Report Summary"], size=120),
+        "Credit Account Type": np.random.choice(CREDIT_CATEGORIES["Credit Account Type"], size=120),
+        "Interest Rate": np.random.uniform(2.5, 18.0, size=120),
+        "Total Payments": np.random.uniform(1000, 20000, size=120),
+        "Credit Utilization Trend": np.random.uniform(0.1, 0.8, size=120),
+    }
+
+    df = with_categories(pd.DataFrame(data), CREDIT_DTYPES)
+    df["Debt-to-Income Ratio"] = df["Total Debt"] / df["Income"]
+
+    # Introduce some variability in interest rates and credit account types over time
+    df.loc[df['Credit Account Type'] == 'Credit Card', 'Interest Rate'] = np.random.uniform(10, 18.0, size=df[df['Credit Account Type'] == 'Credit Card'].shape[0])
+    df.loc[df['Credit Account Type'] == 'Loan', 'Interest Rate'] = np.random.uniform(3, 10, size=df[df['Credit Account Type'] == 'Loan'].shape[0])
+    df.loc[df['Credit Account Type'] == 'Mortgage', 'Interest Rate'] = np.random.uniform(2.5, 5, size=df[df['Credit Account Type'] == 'Mortgage'].shape[0])
+    df.loc[df['Credit Account Type'] == 'Auto Loan', 'Interest Rate'] = np.random.uniform(4, 12, size=df[df['Credit Account Type'] == 'Auto Loan'].shape[0])
+
+    return df
+
+
+# Function to project a frame onto `columns` (None keeps every column)
+def select_columns(df, columns):
+    return df if columns is None else df[list(columns)]
+
+
+# Generate a book of synthetic client profiles, one history per client, with a
+# leading "Client ID" column. The first client is the original sample profile.
+def generate_sample_book(num_clients=SAMPLE_CLIENT_COUNT):
+    frames = []
+    for number in range(num_clients):
+        df = generate_sample_data(seed=42 + number)
+        df.insert(0, "Client ID", f"client-{number:04d}")
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+# Credit history for many clients held as one Arrow table sorted by Client ID.
+# An index maps each client to its (offset, length) row range, so switching
+# clients is a zero-copy slice of the table rather than a reload or a scan.
+# The most recently viewed clients stay materialized as pandas frames.
+class SortedCreditStore:
+    # Edits live in memory and are lost when the process exits
+    durable = False
+
+    def __init__(self, table, recent_size=RECENT_CLIENT_CACHE_SIZE):
+        self._recent = OrderedDict()
+        self._recent_size = recent_size
+        self._versions = {}
+        self._lock = threading.RLock()
+        self._set_table(table)
+
+    @classmethod
+    def from_frame(cls, df, **kwargs):
+        df = df.sort_values("Client ID", kind="stable")
+        return cls(pa.Table.from_pandas(df, preserve_index=False), **kwargs)
+
+    @classmethod
+    def from_ipc(cls, path, **kwargs):
+        # Memory-mapped: only the slices that get viewed are paged in
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        client_ids = table["Client ID"].to_numpy()
+        if len(client_ids) and (client_ids[1:] < client_ids[:-1]).any():
+            table = table.sort_by("Client ID")
+        return cls(table, **kwargs)
+
+    def _set_table(self, table):
+        client_ids = table["Client ID"].to_numpy()
+        ids, offsets, counts = np.unique(client_ids, return_index=True, return_counts=True)
+        self._table = table
+        self._index = {client_id: (int(offset), int(count)) for client_id, offset, count in zip(ids, offsets, counts)}
+        for client_id in self._index:
+            self._versions.setdefault(client_id, 0)
+
+    def clients(self):
+        return list(self._index)
+
+    def version(self, client_id):
+        return self._versions[client_id]
+
+    def _client_frame(self, client_id):
+        with self._lock:
+            df = self._recent.get(client_id)
+            if df is not None:
+                self._recent.move_to_end(client_id)
+                return df
+            offset, length = self._index[client_id]
+            df = with_categories(self._table.slice(offset, length).drop(["Client ID"]).to_pandas(), CREDIT_DTYPES)
+            self._recent[client_id] = df
+            if len(self._recent) > self._recent_size:
+                self._recent.popitem(last=False)
+            return df
+
+    def read(self, client_id, columns=None):
+        return select_columns(self._client_frame(client_id), columns)
+
+    def patch_row(self, client_id, index, values):
+        # Same row count, so the client index stays valid: splice the new rows in
+        # and keep the patched frame as the client's materialized copy
+        with self._lock:
+            current = self._client_frame(client_id)
+            patched = apply_row_patch(current, index, values)
+            rows = pa.Table.from_pandas(patched.assign(**{"Client ID": client_id})[self._table.column_names], preserve_index=False)
+            offset, length = self._index[client_id]
+            table = pa.concat_tables([
+                self._table.slice(0, offset), rows.cast(self._table.schema), self._table.slice(offset + length),
+            ])
+            if table.column(0).num_chunks > MAX_TABLE_CHUNKS:
+                table = table.combine_chunks()
+            self._table = table
+            self._versions[client_id] += 1
+            self._recent[client_id] = patched
+            self._recent.move_to_end(client_id)
+        return current.loc[index], patched
+
+    def write(self, client_id, df):
+        # Rewrites the table around the client's row range; edits are rare next to reads
+        df = df.reset_index(drop=True).copy()
+        df.insert(0, "Client ID", client_id)
+        rows = pa.Table.from_pandas(df, preserve_index=False).cast(self._table.schema)
+        with self._lock:
+            offset, length = self._index.get(client_id, (None, 0))
+            if offset is None:
+                table = pa.concat_tables([self._table, rows]).sort_by("Client ID")
+            else:
+                table = pa.concat_tables([
+                    self._table.slice(0, offset), rows, self._table.slice(offset + length),
+                ])
+            self._set_table(table)
+            self._versions[client_id] = self._versions.get(client_id, -1) + 1
+            self._recent.pop(client_id, None)
+
+
+# Credit history persisted as one columnar file per client under `root`, laid
+# out as root/client_id=<id>/history.arrow (Arrow IPC) or history.parquet.
+# IPC files are memory-mapped and only the requested columns are converted to
+# pandas; Parquet reads decode only the requested column chunks.
+class ArrowCreditStore:
+    durable = True
+
+    def __init__(self, root, file_format="ipc"):
+        if file_format not in ("ipc", "parquet"):
+            raise ValueError(f"Unsupported credit store format: {file_format}")
+        self.root = root
+        self.file_format = file_format
+        self._tables = {}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, client_id):
+        file_name = "history.arrow" if self.file_format == "ipc" else "history.parquet"
+        return os.path.join(self.root, f"client_id={client_id}", file_name)
+
+    def clients(self):
+        prefix = "client_id="
+        return sorted(
+            name[len(prefix):] for name in os.listdir(self.root)
+            if name.startswith(prefix) and os.path.exists(self._path(name[len(prefix):]))
+        )
+
+    def version(self, client_id):
+        return os.stat(self._path(client_id)).st_mtime_ns
+
+    def _table(self, client_id):
+        # Keep the memory-mapped table open until the file changes
+        path = self._path(client_id)
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            cached = self._tables.get(client_id)
+            if cached is None or cached[0] != mtime:
+                with pa.memory_map(path, "r") as source:
+                    table = pa.ipc.open_file(source).read_all()
+                cached = (mtime, table)
+                self._tables[client_id] = cached
+        return cached[1]
+
+    def read(self, client_id, columns=None):
+        if self.file_format == "parquet":
+            table = pq.read_table(self._path(client_id), columns=columns, memory_map=True)
+        else:
+            table = self._table(client_id)
+            if columns is not None:
+                table = table.select(list(columns))
+        return with_categories(table.to_pandas(), CREDIT_DTYPES)
+
+    def patch_row(self, client_id, index, values):
+        current = self.read(client_id)
+        patched = apply_row_patch(current, index, values)
+        self.write(client_id, patched)
+        return current.loc[index], patched
+
+    def write(self, client_id, df):
+        path = self._path(client_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # A temp file of its own per write, so concurrent writers (in any
+        # process) never interleave into the file that gets moved into place
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            if self.file_format == "parquet":
+                pq.write_table(table, temp_path)
+            else:
+                with pa.OSFile(temp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+
+# Function to fill in the columns derived from a row patch
+def derive_patch(row, values):
+    values = dict(values)
+    if "Total Debt" in values or "Income" in values:
+        total_debt = values.get("Total Debt", row["Total Debt"])
+        income = values.get("Income", row["Income"])
+        values["Debt-to-Income Ratio"] = total_debt / income if income != 0 else 0
+    return values
+
+
+# Function to apply a patch to one row of a frame. Columns and the row are
+# checked before anything is written, and the patch lands on a copy, so
+# readers of `df` never see a half-applied edit.
+def apply_row_patch(df, index, values):
+    missing = [column for column in values if column not in df.columns]
+    if missing:
+        raise KeyError(f"Unknown credit history columns: {missing}")
+    if index not in df.index:
+        raise KeyError(f"No credit history row {index}")
+    check_categories(values, CREDIT_DTYPES)
+    patched = df.copy()
+    for column, value in values.items():
+        patched.at[index, column] = value
+    return patched
+
+
+# Function to count the values of a column, leaving out categories that never occur
+def observed_counts(values):
+    counts = values.value_counts()
+    return counts[counts > 0]
+
+
+# Function to update a value-count Series for one row moving from `old` to `new`
+def shift_count(counts, old, new):
+    counts = counts.copy()
+    counts[old] = counts.get(old, 0) - 1
+    counts[new] = counts.get(new, 0) + 1
+    return counts[counts > 0].sort_values(ascending=False)
+
+
+# Every summary number the dashboard views show, built once per dataset
+# version so each view reads its numbers with a lookup. Running sums and
+# counts are kept alongside, so a row edit adjusts only the aggregates whose
+# source columns changed instead of rescanning the history.
+class CreditAggregates:
+    def __init__(self, df):
+        score_changes = df["Credit Score"].pct_change()
+        self._score_change_sum = score_changes.sum()
+        self._score_change_count = int(score_changes.count())
+        self._utilization_sum = df["Credit Utilization"].sum()
+        self._total_inquiries = df["Credit Inquiries"].sum()
+        self._payment_counts = observed_counts(df["Payment History"])
+        self._summary_counts = observed_counts(df["Credit Report Summary"])
+        utilization_groups = df.groupby("Credit Report Summary", observed=True)["Credit Utilization"]
+        self._utilization_sums = utilization_groups.sum()
+        self._utilization_counts = utilization_groups.count()
+        self._highest_debt_to_income = df["Debt-to-Income Ratio"].max()
+        self._top_balances = df.nlargest(5, "Loan Balances")[["Date", "Loan Balances"]]
+        self._top_transactions = df.nlargest(5, "Recent Transactions")[["Date", "Recent Transactions"]]
+        self._publish(df)
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def _publish(self, df):
+        rows = len(df)
+        self.values = {
+            "current_credit_score": df["Credit Score"].iloc[-1],
+            "credit_score_trend": self._score_change_sum / self._score_change_count if self._score_change_count else np.nan,
+            "average_utilization": self._utilization_sum / rows,
+            "late_payments": int(self._payment_counts.get("Late", 0)),
+            "report_summary_counts": self._summary_counts,
+            "total_inquiries": self._total_inquiries,
+            "highest_debt_to_income": self._highest_debt_to_income,
+            "top_balances": self._top_balances,
+            "top_transactions": self._top_transactions,
+            "utilization_by_summary": self._utilization_sums / self._utilization_counts,
+            "payment_history_percent": self._payment_counts / rows * 100,
+            "latest_utilization": df["Credit Utilization"].iloc[-1],
+            "latest_payment_history": df["Payment History"].iloc[-1],
+        }
+
+    # Function to fold one edited row into the aggregates; `df` already holds
+    # the edit and `old_row` is the row as it was before
+    def apply_patch(self, df, index, old_row):
+        new_row = df.loc[index]
+        changed = {column for column in AGGREGATE_COLUMNS if old_row[column] != new_row[column]}
+        position = df.index.get_loc(index)
+
+        if "Credit Score" in changed:
+            # Only the month-over-month changes into and out of this row move
+            scores = df["Credit Score"]
+            old_score, new_score = old_row["Credit Score"], new_row["Credit Score"]
+            if position >= 1:
+                previous = scores.iloc[position - 1]
+                self._score_change_sum += new_score / previous - old_score / previous
+            if position + 1 < len(df):
+                following = scores.iloc[position + 1]
+                self._score_change_sum += following / new_score - following / old_score
+
+        if changed & {"Credit Utilization", "Credit Report Summary"}:
+            old_group, new_group = old_row["Credit Report Summary"], new_row["Credit Report Summary"]
+            old_utilization, new_utilization = old_row["Credit Utilization"], new_row["Credit Utilization"]
+            self._utilization_sum += new_utilization - old_utilization
+            sums, counts = self._utilization_sums.copy(), self._utilization_counts.copy()
+            sums[old_group] -= old_utilization
+            counts[old_group] -= 1
+            sums[new_group] = sums.get(new_group, 0) + new_utilization
+            counts[new_group] = counts.get(new_group, 0) + 1
+            self._utilization_sums = sums[counts > 0].sort_index()
+            self._utilization_counts = counts[counts > 0].sort_index()
+
+        if "Credit Report Summary" in changed:
+            self._summary_counts = shift_count(self._summary_counts, old_row["Credit Report Summary"], new_row["Credit Report Summary"])
+
+        if "Payment History" in changed:
+            self._payment_counts = shift_count(self._payment_counts, old_row["Payment History"], new_row["Payment History"])
+
+        if "Credit Inquiries" in changed:
+            self._total_inquiries += new_row["Credit Inquiries"] - old_row["Credit Inquiries"]
+
+        if "Debt-to-Income Ratio" in changed:
+            old_ratio, new_ratio = old_row["Debt-to-Income Ratio"], new_row["Debt-to-Income Ratio"]
+            if new_ratio >= self._highest_debt_to_income:
+                self._highest_debt_to_income = new_ratio
+            elif old_ratio >= self._highest_debt_to_income:
+                # The old maximum went down; only then is a rescan needed
+                self._highest_debt_to_income = df["Debt-to-Income Ratio"].max()
+
+        # Top-5 lists only change if the row was in them or now beats the fifth place
+        for attribute, column in (("_top_balances", "Loan Balances"), ("_top_transactions", "Recent Transactions")):
+            top = getattr(self, attribute)
+            if changed & {column, "Date"} and (index in top.index or new_row[column] >= top[column].min() or len(top) < 5):
+                setattr(self, attribute, df.nlargest(5, column)[["Date", column]])
+
+        self._publish(df)
+
+
+# Function to get the aggregates of a client's stored history, shared by every
+# session and rebuilt only when the store reports a version they do not cover
+def shared_aggregates(store, client_id):
+    version = store.version(client_id)
+    key = (id(store), client_id)
+    with _aggregate_lock:
+        cached = _shared_aggregates.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    aggregates = CreditAggregates(store.read(client_id, AGGREGATE_COLUMNS))
+    with _aggregate_lock:
+        _shared_aggregates[key] = (version, aggregates)
+    return aggregates
+
+
+# Function to apply an edit to one row of a client's stored history and fold
+# it into the shared aggregates instead of rebuilding them
+def patch_client_row(store, client_id, index, values):
+    key = (id(store), client_id)
+    with _aggregate_lock:
+        cached = _shared_aggregates.get(key)
+        current = cached is not None and cached[0] == store.version(client_id)
+        old_row, patched = store.patch_row(client_id, index, values)
+        if current:
+            cached[1].apply_patch(patched, index, old_row)
+            _shared_aggregates[key] = (store.version(client_id), cached[1])
+    return patched
+
+
+# Function to get the process-wide credit store. Every session shares it, so
+# callers must treat frames it returns as read-only and write through a
+# CreditDataView instead.
+def get_credit_store():
+    global _credit_store
+    if _credit_store is None:
+        with _store_lock:
+            if _credit_store is None:
+                if CREDIT_STORE_PATH:
+                    store = ArrowCreditStore(CREDIT_STORE_PATH, CREDIT_STORE_FORMAT)
+                    if not store.clients():
+                        for client_id, df in generate_sample_book().groupby("Client ID"):
+                            store.write(client_id, df.drop(columns="Client ID"))
+                elif CREDIT_BOOK_PATH:
+                    store = SortedCreditStore.from_ipc(CREDIT_BOOK_PATH)
+                else:
+                    store = SortedCreditStore.from_frame(generate_sample_book())
+                _credit_store = store
+    return _credit_store
+
+
+# View of one client's credit history in the shared store. Reads are
+# projected onto the columns a view needs. Edits are written to the store, so
+# every session sees them, and folded into the shared aggregates. They last as
+# long as the store does: across restarts for an ArrowCreditStore, until the
+# process exits for the in-memory SortedCreditStore.
+class CreditDataView:
+    def __init__(self, store, client_id=SAMPLE_CLIENT):
+        self._store = store
+        self.client_id = client_id
+
+    def frame(self, columns=None):
+        return self._store.read(self.client_id, columns)
+
+    def apply_patch(self, index, values):
+        values = derive_patch(self.frame().loc[index], values)
+        patch_client_row(self._store, self.client_id, index, values)
+
+    def aggregates(self):
+        return shared_aggregates(self._store, self.client_id)
@@ -0,0 +1,59 @@
+import gzip
+import io
+import tempfile
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Rows serialized per chunk; bounds the working memory of an export
+EXPORT_CHUNK_ROWS = 50_000
+
+# Exports larger than this spill from memory to a temporary file while being written
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+# Download formats offered next to every export button: extension and MIME type
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+# Function to write `df` chunk by chunk into `sink` as CSV, optionally gzipped
+def write_csv(df, sink, compress=False, chunk_rows=EXPORT_CHUNK_ROWS):
+    raw = gzip.GzipFile(fileobj=sink, mode="wb") if compress else sink
+    text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    try:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            df.iloc[start:start + chunk_rows].to_csv(text, header=start == 0, index=False)
+        text.flush()
+    finally:
+        # Detach so closing the wrapper leaves `sink` open for the caller
+        text.detach()
+        if compress:
+            raw.close()
+
+
+# Function to write `df` into `sink` as Parquet, one row group per chunk
+def write_parquet(df, sink, chunk_rows=EXPORT_CHUNK_ROWS):
+    schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+    with pq.ParquetWriter(sink, schema) as writer:
+        for start in range(0, len(df), chunk_rows):
+            chunk = pa.Table.from_pandas(df.iloc[start:start + chunk_rows], schema=schema, preserve_index=False)
+            writer.write_table(chunk)
+
+
+# Function to serialize a frame for download without building the whole file as
+# one Python string. Chunks are written to a spooled temporary file, which
+# moves to disk past SPOOL_MAX_BYTES, and read back once as the download bytes.
+# Returns keyword arguments for st.download_button.
+def export_download(df, base_name, export_format="CSV", chunk_rows=EXPORT_CHUNK_ROWS):
+    extension, mime = EXPORT_FORMATS[export_format]
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+        if export_format == "Parquet":
+            write_parquet(df, spool, chunk_rows)
+        else:
+            write_csv(df, spool, compress=export_format == "CSV (gzip)", chunk_rows=chunk_rows)
+        spool.seek(0)
+        data = spool.read()
+    return {"data": data, "file_name": f"{base_name}.{extension}", "mime": mime}
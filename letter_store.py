@@ -0,0 +1,358 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+import pandas as pd
+
+from schema import TRACKER_CATEGORIES, TRACKER_DTYPES, check_categories, with_categories
+
+# Columns of the dispute letter tracking table, in display order
+TRACKER_COLUMNS = [
+    'Client Name',
+    'Letter Subject',
+    'Date Sent',
+    'Status',
+    'To-Do List',
+    'Notes',
+    'Dispute Type',
+    'Credit Bureau',
+    'Priority',
+]
+
+# SQLite column behind each tracker column
+SQL_COLUMNS = {
+    'Client Name': 'client_name',
+    'Letter Subject': 'letter_subject',
+    'Date Sent': 'date_sent',
+    'Status': 'status',
+    'To-Do List': 'to_do_list',
+    'Notes': 'notes',
+    'Dispute Type': 'dispute_type',
+    'Credit Bureau': 'credit_bureau',
+    'Priority': 'priority',
+}
+
+# Expression each tracker column sorts by. Enumerated columns sort in their
+# display order from schema.TRACKER_CATEGORIES rather than alphabetically;
+# values outside it sort last.
+SORT_SQL = {
+    column: (
+        f"CASE {SQL_COLUMNS[column]} "
+        + " ".join(f"WHEN '{value}' THEN {position}" for position, value in enumerate(TRACKER_CATEGORIES[column]))
+        + f" ELSE {len(TRACKER_CATEGORIES[column])} END"
+    ) if column in TRACKER_CATEGORIES else SQL_COLUMNS[column]
+    for column in TRACKER_COLUMNS
+}
+
+# Tracker columns that filters and summaries look up by value
+INDEXED_COLUMNS = ['Client Name', 'Status', 'Credit Bureau', 'Priority', 'Date Sent']
+
+# Columns that identify a letter when an import merges into existing letters
+LETTER_KEY = ['Client Name', 'Letter Subject', 'Date Sent']
+
+# Days a bureau has to answer a dispute, by letter status. Letters under
+# review get the 45-day window that applies once the consumer sends more
+# information; resolved letters have no deadline.
+RESPONSE_WINDOW_DAYS = {'Sent': 30, 'Pending': 30, 'In Review': 45}
+
+# A letter's response deadline in SQL. It is indexed, so deadline ranges are
+# B-tree lookups; queries must use this exact expression to hit the index.
+DEADLINE_SQL = (
+    "date(date_sent, '+' || CASE status "
+    + " ".join(f"WHEN '{status}' THEN {days}" for status, days in RESPONSE_WINDOW_DAYS.items())
+    + " END || ' days')"
+)
+
+# Rows parsed, validated and written per chunk of an imported CSV
+IMPORT_CHUNK_ROWS = 50_000
+
+# How imported letters combine with the stored ones
+IMPORT_MODES = ("merge", "append", "replace")
+
+# Invalid rows kept for display; the rest are only counted
+MAX_IMPORT_ERRORS = 1000
+
+# Outcome of a CSV import; `errors` holds up to MAX_IMPORT_ERRORS invalid rows
+ImportReport = namedtuple("ImportReport", ["rows_read", "inserted", "updated", "error_count", "errors", "seconds"])
+
+# Database file shared by every session of the tracker
+TRACKER_DB_PATH = os.environ.get("TRACKER_DB_PATH", "credit_dispute_tracker.db")
+
+_store_lock = threading.Lock()
+_letter_store = None
+
+
+# Function to turn a Date Sent value into the ISO date text stored in SQLite
+def to_sql_date(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return pd.Timestamp(value).date().isoformat()
+
+
+# Function to compute the response deadline of every letter in `df` in one
+# vectorized pass; letters without a deadline get NaT
+def response_deadlines(df):
+    windows = df['Status'].map(RESPONSE_WINDOW_DAYS).astype(float)
+    return (pd.to_datetime(df['Date Sent']) + pd.to_timedelta(windows, unit='D')).rename('Response Due')
+
+
+# Function to turn a tracker value into what SQLite stores; missing values become NULL
+def to_sql_value(column, value):
+    if column == 'Date Sent':
+        return to_sql_date(value)
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return str(value)
+
+
+# Function to read tracker CSV text with every column pinned to a string dtype,
+# so nothing is type-guessed and chunks of one file always agree
+def read_letters_csv(source, chunk_rows=IMPORT_CHUNK_ROWS):
+    return pd.read_csv(
+        source,
+        usecols=lambda column: column in TRACKER_COLUMNS,
+        dtype={column: "string" for column in TRACKER_COLUMNS},
+        chunksize=chunk_rows,
+    )
+
+
+# Function to check one chunk of imported letters. Returns the valid rows in
+# tracker dtypes (categories for enumerated columns, datetimes for Date Sent)
+# and a frame with one line per rejected value.
+def validate_letters(chunk):
+    missing = [column for column in TRACKER_COLUMNS if column not in chunk.columns]
+    if missing:
+        raise ValueError(f"CSV is missing tracker columns: {', '.join(missing)}")
+    chunk = chunk[TRACKER_COLUMNS].apply(lambda values: values.str.strip())
+    problems = []
+    blank = chunk.isna() | chunk.eq('')
+    # Status is required too: it decides the letter's response deadline
+    for column in ('Client Name', 'Letter Subject', 'Status'):
+        problems.append((blank[column], column, "is required"))
+    dates = pd.to_datetime(chunk['Date Sent'], format="ISO8601", errors="coerce")
+    problems.append((dates.isna(), 'Date Sent', "is not a YYYY-MM-DD date"))
+    for column, categories in TRACKER_CATEGORIES.items():
+        unknown = ~blank[column] & ~chunk[column].isin(categories)
+        problems.append((unknown, column, f"must be one of {', '.join(categories)}"))
+
+    errors = pd.concat([
+        # Line in the file, counting the header as line 1
+        pd.DataFrame({'Line': chunk.index[mask] + 2, 'Column': column, 'Value': chunk.loc[mask, column].to_numpy(), 'Error': message})
+        for mask, column, message in problems
+    ], ignore_index=True)
+    invalid = pd.concat([mask for mask, _, _ in problems], axis=1).any(axis=1)
+
+    valid = chunk[~invalid].assign(**{'Date Sent': dates[~invalid]})
+    return with_categories(valid, TRACKER_DTYPES), errors.sort_values('Line', kind='stable').reset_index(drop=True)
+
+
+# Function to turn a frame of validated letters into SQLite row tuples, column at a time
+def to_sql_rows(df):
+    columns = []
+    for column in TRACKER_COLUMNS:
+        values = df[column]
+        if column == 'Date Sent':
+            values = values.dt.strftime('%Y-%m-%d')
+        values = values.astype(object)
+        columns.append(values.where(values.notna(), None).tolist())
+    return zip(*columns)
+
+
+# Dispute letters persisted in an embedded SQLite database in WAL mode, so
+# readers never block the writer and every advisor sees the same letters.
+# Each thread (Streamlit runs one per session) keeps its own connection.
+class SQLiteLetterStore:
+    def __init__(self, path=TRACKER_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS letters (id INTEGER PRIMARY KEY, "
+                + ", ".join(f"{SQL_COLUMNS[column]} TEXT" for column in TRACKER_COLUMNS)
+                + ")"
+            )
+            for column in INDEXED_COLUMNS:
+                sql_column = SQL_COLUMNS[column]
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_letters_{sql_column} ON letters ({sql_column})")
+            key_columns = ", ".join(SQL_COLUMNS[column] for column in LETTER_KEY)
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_letters_key ON letters ({key_columns})")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_letters_deadline ON letters ({DEADLINE_SQL})")
+
+    def _connection(self):
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = conn
+        return conn
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM letters").fetchone()[0]
+
+    def _insert(self, conn, records):
+        columns = ", ".join(SQL_COLUMNS[column] for column in TRACKER_COLUMNS)
+        placeholders = ", ".join("?" for _ in TRACKER_COLUMNS)
+        rows = (
+            tuple(to_sql_value(column, record.get(column)) for column in TRACKER_COLUMNS)
+            for record in records
+        )
+        conn.executemany(f"INSERT INTO letters ({columns}) VALUES ({placeholders})", rows)
+
+    def append_many(self, records):
+        records = list(records)
+        for record in records:
+            check_categories(record, TRACKER_DTYPES)
+        conn = self._connection()
+        with conn:
+            self._insert(conn, records)
+
+    def append(self, record):
+        self.append_many([record])
+
+    def replace(self, df):
+        # One transaction: other sessions see either the old letters or the new ones
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM letters")
+            self._insert(conn, df.to_dict("records"))
+
+    # Function to stream a tracker CSV into the store. Each chunk is validated,
+    # invalid rows are reported rather than stored, and the valid rows are
+    # appended, merged by LETTER_KEY (updating matches and inserting the rest)
+    # or used to replace every letter. The whole import is one transaction.
+    def import_csv(self, source, mode="merge", chunk_rows=IMPORT_CHUNK_ROWS):
+        if mode not in IMPORT_MODES:
+            raise ValueError(f"Unknown import mode: {mode}")
+        started = time.perf_counter()
+        rows_read = inserted = updated = error_count = 0
+        errors = []
+        columns = ", ".join(SQL_COLUMNS[column] for column in TRACKER_COLUMNS)
+        placeholders = ", ".join("?" for _ in TRACKER_COLUMNS)
+        conn = self._connection()
+        with conn:
+            if mode == "replace":
+                conn.execute("DELETE FROM letters")
+            if mode == "merge":
+                conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS letters_import ({columns})")
+            for chunk in read_letters_csv(source, chunk_rows):
+                rows_read += len(chunk)
+                valid, chunk_errors = validate_letters(chunk)
+                error_count += len(chunk_errors)
+                if len(errors) < MAX_IMPORT_ERRORS:
+                    errors.append(chunk_errors.head(MAX_IMPORT_ERRORS - len(errors)))
+                if mode != "merge":
+                    inserted += conn.executemany(f"INSERT INTO letters ({columns}) VALUES ({placeholders})", to_sql_rows(valid)).rowcount
+                    continue
+                # Merge: stage the chunk, update letters whose key matches, insert the rest
+                valid = valid.drop_duplicates(LETTER_KEY, keep="last")
+                conn.execute("DELETE FROM letters_import")
+                conn.executemany(f"INSERT INTO letters_import ({columns}) VALUES ({placeholders})", to_sql_rows(valid))
+                matches = " AND ".join(f"letters.{SQL_COLUMNS[column]} = staged.{SQL_COLUMNS[column]}" for column in LETTER_KEY)
+                assignments = ", ".join(f"{column} = staged.{column}" for column in SQL_COLUMNS.values())
+                updated += conn.execute(f"UPDATE letters SET {assignments} FROM letters_import AS staged WHERE {matches}").rowcount
+                inserted += conn.execute(
+                    f"INSERT INTO letters ({columns}) SELECT {columns} FROM letters_import AS staged "
+                    f"WHERE NOT EXISTS (SELECT 1 FROM letters WHERE {matches})"
+                ).rowcount
+        errors = pd.concat(errors, ignore_index=True) if errors else pd.DataFrame(columns=['Line', 'Column', 'Value', 'Error'])
+        return ImportReport(rows_read, inserted, updated, error_count, errors, time.perf_counter() - started)
+
+    # Function to build the WHERE clause for equality filters on tracker
+    # columns plus an optional Date Sent range; every filter hits an index
+    def _where(self, filters, date_from=None, date_to=None):
+        clauses, params = [], []
+        for column, value in (filters or {}).items():
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                if not value:
+                    continue
+                clauses.append(f"{SQL_COLUMNS[column]} IN ({', '.join('?' for _ in value)})")
+                params.extend(value)
+            else:
+                clauses.append(f"{SQL_COLUMNS[column]} = ?")
+                params.append(value)
+        if date_from is not None:
+            clauses.append("date_sent >= ?")
+            params.append(to_sql_date(date_from))
+        if date_to is not None:
+            clauses.append("date_sent <= ?")
+            params.append(to_sql_date(date_to))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _select(self, where, params, order_by="id", limit=None, offset=0):
+        columns = ", ".join(SQL_COLUMNS[column] for column in TRACKER_COLUMNS)
+        sql = f"SELECT {columns} FROM letters{where} ORDER BY {order_by}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params = list(params) + [int(limit), int(offset)]
+        rows = self._connection().execute(sql, params).fetchall()
+        df = pd.DataFrame(rows, columns=TRACKER_COLUMNS)
+        df['Date Sent'] = pd.to_datetime(df['Date Sent'])
+        return with_categories(df, TRACKER_DTYPES)
+
+    def frame(self, filters=None, date_from=None, date_to=None):
+        where, params = self._where(filters, date_from, date_to)
+        return self._select(where, params)
+
+    def count(self, filters=None, date_from=None, date_to=None):
+        where, params = self._where(filters, date_from, date_to)
+        return self._connection().execute(f"SELECT COUNT(*) FROM letters{where}", params).fetchone()[0]
+
+    # Function to fetch one page of letters with filtering and sorting done in
+    # SQLite, so only `page_size` rows ever reach pandas and the browser.
+    def page(self, filters=None, date_from=None, date_to=None, sort_by='Date Sent', ascending=False, page_size=50, page_number=1):
+        where, params = self._where(filters, date_from, date_to)
+        direction = "ASC" if ascending else "DESC"
+        # Insertion order breaks ties so pages never overlap or skip rows
+        order_by = f"{SORT_SQL[sort_by]} {direction}, id {direction}"
+        offset = (max(int(page_number), 1) - 1) * page_size
+        return self._select(where, params, order_by, page_size, offset)
+
+    def _deadline_where(self, start=None, end=None):
+        clauses, params = [f"{DEADLINE_SQL} IS NOT NULL"], []
+        if start is not None:
+            clauses.append(f"{DEADLINE_SQL} >= ?")
+            params.append(to_sql_date(start))
+        if end is not None:
+            clauses.append(f"{DEADLINE_SQL} <= ?")
+            params.append(to_sql_date(end))
+        return " WHERE " + " AND ".join(clauses), params
+
+    # Function to fetch letters whose response deadline falls between `start`
+    # and `end` (inclusive, either may be open), soonest first. Served from the
+    # deadline index, so the cost is one index seek plus the rows returned.
+    def due_between(self, start=None, end=None, limit=None):
+        where, params = self._deadline_where(start, end)
+        df = self._select(where, params, f"{DEADLINE_SQL}, id", limit)
+        df['Response Due'] = response_deadlines(df)
+        return df
+
+    def count_due(self, start=None, end=None):
+        where, params = self._deadline_where(start, end)
+        return self._connection().execute(f"SELECT COUNT(*) FROM letters{where}", params).fetchone()[0]
+
+    def count_by(self, column, filters=None, date_from=None, date_to=None):
+        where, params = self._where(filters, date_from, date_to)
+        sql_column = SQL_COLUMNS[column]
+        rows = self._connection().execute(
+            f"SELECT {sql_column}, COUNT(*) FROM letters{where} GROUP BY {sql_column} ORDER BY COUNT(*) DESC", params
+        ).fetchall()
+        return pd.Series(dict(rows), name="Letters", dtype="int64")
+
+
+# Function to get the process-wide letter store, seeding an empty database with `seed_df`
+def get_letter_store(seed_df=None):
+    global _letter_store
+    if _letter_store is None:
+        with _store_lock:
+            if _letter_store is None:
+                store = SQLiteLetterStore()
+                if seed_df is not None and len(store) == 0:
+                    store.replace(seed_df)
+                _letter_store = store
+    return _letter_store
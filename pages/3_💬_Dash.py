@@ -1,8 +1,10 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.express as px
 from datetime import datetime, timedelta
+from dashboard_data import get_credit_store, CreditDataView, VIEW_COLUMNS
+from exports import export_download, EXPORT_FORMATS
+from schema import CREDIT_CATEGORIES
 
 st.sidebar.image("logooo.png", use_column_width=True)
 
@@ -10,50 +12,16 @@ if "authenticated" not in st.session_state or not st.session_state.authenticated
     st.error("You need to log in to access this page.")
     st.stop()
     
-# Generate sample data
-def generate_sample_data():
-    np.random.seed(42)
-    dates = pd.date_range(start="2014-01-01", periods=120, freq='M')  # 10 years of monthly data
-    
-    # Extended and diversified data
-    data = {
-        "Date": dates,
-        "Credit Score": np.random.randint(650, 850, size=120),
-        "Credit Utilization": np.random.uniform(0.2, 0.9, size=120),
-        "Total Debt": np.random.randint(1000, 20000, size=120),
-        "Monthly Payments": np.random.randint(100, 2000, size=120),
-        "Income": np.random.randint(3000, 10000, size=120),
-        "New Credit Accounts": np.random.randint(0, 5, size=120),
-        "Credit Limits": np.random.randint(5000, 50000, size=120),
-        "Payment History": np.random.choice(["On Time", "Late"], size=120, p=[0.85, 0.15]),
-        "Loan Balances": np.random.randint(1000, 20000, size=120),
-        "Account Age (Months)": np.random.randint(1, 180, size=120),
-        "Recent Transactions": np.random.randint(0, 20, size=120),
-        "Upcoming Payments": np.random.randint(50, 2000, size=120),
-        "Credit Inquiries": np.random.randint(0, 10, size=120),
-        "Credit Report Summary": np.random.choice(["Excellent", "Good", "Average", "Poor"], size=120),
-        "Credit Account Type": np.random.choice(["Credit Card", "Loan", "Mortgage", "Auto Loan"], size=120),
-        "Interest Rate": np.random.uniform(2.5, 18.0, size=120),
-        "Total Payments": np.random.uniform(1000, 20000, size=120),
-        "Credit Utilization Trend": np.random.uniform(0.1, 0.8, size=120),
-    }
-    
-    df = pd.DataFrame(data)
-    df["Debt-to-Income Ratio"] = df["Total Debt"] / df["Income"]
-    
-    # Introduce some variability in interest rates and credit account types over time
-    df.loc[df['Credit Account Type'] == 'Credit Card', 'Interest Rate'] = np.random.uniform(10, 18.0, size=df[df['Credit Account Type'] == 'Credit Card'].shape[0])
-    df.loc[df['Credit Account Type'] == 'Loan', 'Interest Rate'] = np.random.uniform(3, 10, size=df[df['Credit Account Type'] == 'Loan'].shape[0])
-    df.loc[df['Credit Account Type'] == 'Mortgage', 'Interest Rate'] = np.random.uniform(2.5, 5, size=df[df['Credit Account Type'] == 'Mortgage'].shape[0])
-    df.loc[df['Credit Account Type'] == 'Auto Loan', 'Interest Rate'] = np.random.uniform(4, 12, size=df[df['Credit Account Type'] == 'Auto Loan'].shape[0])
-    
-    return df
-
-df = generate_sample_data()
+# Shared credit history store, opened once per process; edits are written to it and seen by every session
+credit_store = get_credit_store()
 
 # Streamlit app
 st.title("Credit Management Dashboard")
 
+# Client selector; switching clients slices the indexed store instead of reloading
+client_id = st.sidebar.selectbox("Client", credit_store.clients())
+credit_data = CreditDataView(credit_store, client_id)
+
 # Sidebar for navigation
 st.sidebar.title("Navigation")
 page = st.sidebar.radio("Go to", [
@@ -86,14 +54,18 @@ page = st.sidebar.radio("Go to", [
     "Export Data"
 ])
 
+# Load only the columns the selected view uses; summary numbers are precomputed
+df = credit_data.frame(VIEW_COLUMNS[page])
+aggregates = credit_data.aggregates()
+
 # Display selected page
 if page == "Credit Score Overview":
     st.subheader("Credit Score Overview")
-    st.write(f"Current Credit Score: {df['Credit Score'].iloc[-1]}")
+    st.write(f"Current Credit Score: {aggregates['current_credit_score']}")
     st.line_chart(df[['Date', 'Credit Score']].set_index('Date'))
     
     # Detailed Analysis
-    trend = "increasing" if df['Credit Score'].pct_change().mean() > 0 else "decreasing"
+    trend = "increasing" if aggregates['credit_score_trend'] > 0 else "decreasing"
     st.write(f"Overall trend: {trend}")
     st.write("Ensure your credit score remains in good health by following the improvement tips on the relevant page.")
     st.write("### Insights:")
@@ -104,7 +76,7 @@ elif page == "Credit Utilization":
     st.bar_chart(df[['Date', 'Credit Utilization']].set_index('Date'))
     
     # Utilization Analysis
-    avg_utilization = df['Credit Utilization'].mean()
+    avg_utilization = aggregates['average_utilization']
     st.write(f"Average Credit Utilization: {avg_utilization:.2%}")
     st.write("A utilization rate below 30% is generally recommended.")
     st.write("### Insights:")
@@ -115,14 +87,14 @@ elif page == "Payment History":
     st.write(df[['Date', 'Payment History']].set_index('Date'))
     
     # Payment History Analysis
-    late_payments = df[df['Payment History'] == "Late"].shape[0]
+    late_payments = aggregates['late_payments']
     st.write(f"Number of Late Payments: {late_payments}")
     st.write("### Insights:")
     st.write("Timely payments are crucial for maintaining a good credit score. Address any late payments promptly.")
 
 elif page == "Credit Report Summary":
     st.subheader("Credit Report Summary")
-    summary_counts = df['Credit Report Summary'].value_counts()
+    summary_counts = aggregates['report_summary_counts']
     st.bar_chart(summary_counts)
     st.write("Review your credit report summary for a quick overview of your credit standing.")
     st.write("### Insights:")
@@ -133,7 +105,7 @@ elif page == "Credit Inquiries":
     st.line_chart(df[['Date', 'Credit Inquiries']].set_index('Date'))
     
     # Detailed Analysis
-    total_inquiries = df['Credit Inquiries'].sum()
+    total_inquiries = aggregates['total_inquiries']
     st.write(f"Total Credit Inquiries: {total_inquiries}")
     st.write("### Insights:")
     st.write("Frequent credit inquiries can negatively affect your credit score. Limit new credit applications.")
@@ -150,7 +122,7 @@ elif page == "Debt-to-Income Ratio":
     
     # Ratio Interpretation
     st.write("A lower debt-to-income ratio indicates better financial health.")
-    high_ratio = df['Debt-to-Income Ratio'].max()
+    high_ratio = aggregates['highest_debt_to_income']
     st.write(f"Highest Recorded Ratio: {high_ratio:.2%}")
     st.write("### Insights:")
     st.write("Maintaining a low debt-to-income ratio is essential for financial stability.")
@@ -175,22 +147,22 @@ elif page == "Monthly Payments":
 
 elif page == "Credit Accounts Breakdown":
     st.subheader("Credit Accounts Breakdown")
-    account_types = df['Credit Report Summary'].value_counts()
+    account_types = aggregates['report_summary_counts']
     st.bar_chart(account_types)
     st.write("### Insights:")
     st.write("Understanding the breakdown of your credit accounts helps in managing and optimizing your credit profile.")
 
 elif page == "Top 5 Highest Balances":
     st.subheader("Top 5 Highest Balances")
-    top_balances = df.nlargest(5, 'Loan Balances')
-    st.write(top_balances[['Date', 'Loan Balances']])
+    top_balances = aggregates['top_balances']
+    st.write(top_balances)
     st.write("### Insights:")
     st.write("Identify and manage accounts with the highest balances to reduce your overall debt burden.")
 
 elif page == "Top 5 Recent Transactions":
     st.subheader("Top 5 Recent Transactions")
-    top_transactions = df.nlargest(5, 'Recent Transactions')
-    st.write(top_transactions[['Date', 'Recent Transactions']])
+    top_transactions = aggregates['top_transactions']
+    st.write(top_transactions)
     st.write("### Insights:")
     st.write("Monitoring recent transactions can help in understanding spending patterns and adjusting budgeting strategies.")
 
@@ -203,14 +175,14 @@ elif page == "Upcoming Payments":
 elif page == "Credit Utilization by Account Type":
     st.subheader("Credit Utilization by Account Type")
     account_types = ['Credit Card', 'Loan', 'Mortgage']
-    utilization_by_type = df.groupby('Credit Report Summary')['Credit Utilization'].mean()
+    utilization_by_type = aggregates['utilization_by_summary']
     st.bar_chart(utilization_by_type)
     st.write("### Insights:")
     st.write("Analyze credit utilization by account type to understand how different types of credit impact your overall utilization.")
 
 elif page == "Average Payment History":
     st.subheader("Average Payment History")
-    payment_history_avg = df['Payment History'].value_counts(normalize=True) * 100
+    payment_history_avg = aggregates['payment_history_percent']
     st.bar_chart(payment_history_avg)
     st.write("### Insights:")
     st.write("Maintaining an average of timely payments is crucial for a positive credit history.")
@@ -260,7 +232,7 @@ elif page == "Credit Score Impact Simulation":
     st.write("Simulate how changes in your credit behavior could impact your credit score.")
     # Interactive simulation
     score_change = st.slider("Projected Credit Score Change", min_value=-100, max_value=100, value=0)
-    projected_score = df['Credit Score'].iloc[-1] + score_change
+    projected_score = aggregates['current_credit_score'] + score_change
     st.write(f"Projected Credit Score: {projected_score}")
     st.write("### Insights:")
     st.write("Understand how different scenarios affect your credit score to make informed financial decisions.")
@@ -293,14 +265,16 @@ elif page == "Credit Score Improvement Tips":
 elif page == "Alerts and Recommendations":
     st.subheader("Alerts and Recommendations")
     st.write("Based on your data, here are some alerts and recommendations:")
-    if df['Credit Utilization'].iloc[-1] > 0.3:
+    if aggregates['latest_utilization'] > 0.3:
         st.warning("Your credit utilization is high. Consider paying down your balances.")
-    if df['Payment History'].iloc[-1] == "Late":
+    if aggregates['latest_payment_history'] == "Late":
         st.warning("You have recent late payments. Ensure you pay on time to avoid further impacts.")
     
 elif page == "Edit Credit Info":
     st.subheader("Edit Credit Information")
     st.write("Update your credit data directly.")
+    if not credit_store.durable:
+        st.caption("Edits are shared with every session until the app restarts; set CREDIT_STORE_PATH to keep them.")
     
     # Forms for editing
     with st.form(key='edit_form'):
@@ -312,29 +286,30 @@ elif page == "Edit Credit Info":
         monthly_payments = st.number_input("Monthly Payments", min_value=0, max_value=10000, value=int(df.loc[date_index, 'Monthly Payments']))
         new_credit_accounts = st.number_input("New Credit Accounts", min_value=0, max_value=10, value=int(df.loc[date_index, 'New Credit Accounts']))
         credit_limits = st.number_input("Credit Limits", min_value=5000, max_value=20000, value=int(df.loc[date_index, 'Credit Limits']))
-        payment_history = st.selectbox("Payment History", ["On Time", "Late"], index=0 if df.loc[date_index, 'Payment History'] == "On Time" else 1)
+        payment_history = st.selectbox("Payment History", CREDIT_CATEGORIES["Payment History"], index=CREDIT_CATEGORIES["Payment History"].index(df.loc[date_index, 'Payment History']))
         
         submit_button = st.form_submit_button(label='Update Information')
         
         if submit_button:
-            df.loc[date_index, 'Credit Score'] = credit_score
-            df.loc[date_index, 'Credit Utilization'] = credit_utilization
-            df.loc[date_index, 'Total Debt'] = total_debt
-            df.loc[date_index, 'Income'] = income
-            df.loc[date_index, 'Monthly Payments'] = monthly_payments
-            df.loc[date_index, 'New Credit Accounts'] = new_credit_accounts
-            df.loc[date_index, 'Credit Limits'] = credit_limits
-            df.loc[date_index, 'Payment History'] = payment_history
-            df.loc[date_index, 'Debt-to-Income Ratio'] = total_debt / income if income != 0 else 0
+            # One atomic, persisted row patch; Debt-to-Income Ratio and the summary numbers follow incrementally
+            credit_data.apply_patch(date_index, {
+                'Credit Score': credit_score,
+                'Credit Utilization': credit_utilization,
+                'Total Debt': total_debt,
+                'Income': income,
+                'Monthly Payments': monthly_payments,
+                'New Credit Accounts': new_credit_accounts,
+                'Credit Limits': credit_limits,
+                'Payment History': payment_history,
+            })
+            df = credit_data.frame(VIEW_COLUMNS[page])
             st.success(f"Information updated for {df.loc[date_index, 'Date']}")
 
 elif page == "Export Data":
     st.subheader("Export Data")
-    st.write("Download your credit data in CSV format.")
-    csv = df.to_csv(index=False)
+    st.write("Download your credit data as CSV, gzipped CSV or Parquet.")
+    export_format = st.selectbox("Format", list(EXPORT_FORMATS))
     st.download_button(
-        label="Download CSV",
-        data=csv,
-        file_name='credit_data.csv',
-        mime='text/csv'
+        label="Download",
+        **export_download(df, f'credit_data_{client_id}', export_format)
     )
@@ -1,6 +1,9 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, date, timedelta
+from exports import export_download, EXPORT_FORMATS
+from letter_store import get_letter_store, response_deadlines, IMPORT_MODES
+from schema import TRACKER_CATEGORIES
 
 # Set Streamlit to use the full width of the page
 st.set_page_config(layout="wide")
@@ -32,9 +35,8 @@ sample_data = {
                  'Low', 'High', 'Medium', 'Low', 'High']
 }
 
-# Initialize session state for the tracking DataFrame
-if 'df' not in st.session_state:
-    st.session_state.df = pd.DataFrame(sample_data)
+# Shared, durable letter store; seeded with the sample letters on first use
+letters = get_letter_store(seed_df=pd.DataFrame(sample_data))
 
 # Function to add a new row (letter) to the DataFrame
 def add_letter(client_name, letter_subject, date_sent, status, to_do_list, notes, dispute_type, credit_bureau, priority):
@@ -49,7 +51,7 @@ def add_letter(client_name, letter_subject, date_sent, status, to_do_list, notes
         'Credit Bureau': credit_bureau,
         'Priority': priority
     }
-    st.session_state.df = st.session_state.df.append(new_row, ignore_index=True)
+    letters.append(new_row)
 
 # Streamlit UI Components
 st.title("Enhanced Credit Dispute Letter Tracker")
@@ -60,36 +62,81 @@ with st.form("add_letter_form"):
     client_name = st.text_input("Client Name")
     letter_subject = st.text_input("Letter Subject")
     date_sent = st.date_input("Date Sent")
-    status = st.selectbox("Status", ["Sent", "In Review", "Resolved", "Pending"])
+    status = st.selectbox("Status", TRACKER_CATEGORIES['Status'])
     to_do_list = st.text_area("To-Do List (Separate tasks with commas)")
     notes = st.text_area("Additional Notes")
-    dispute_type = st.selectbox("Dispute Type", ["Credit Report", "Identity Theft", "Fraudulent Account", "Incorrect Info", "Duplicate Account"])
-    credit_bureau = st.selectbox("Credit Bureau", ["Experian", "TransUnion", "Equifax"])
-    priority = st.selectbox("Priority", ["High", "Medium", "Low"])
+    dispute_type = st.selectbox("Dispute Type", TRACKER_CATEGORIES['Dispute Type'])
+    credit_bureau = st.selectbox("Credit Bureau", TRACKER_CATEGORIES['Credit Bureau'])
+    priority = st.selectbox("Priority", TRACKER_CATEGORIES['Priority'])
     
     if st.form_submit_button("Add Letter"):
         if client_name and letter_subject:
             add_letter(client_name, letter_subject, date_sent, status, to_do_list, notes, dispute_type, credit_bureau, priority)
             st.success("Letter and tasks added successfully!")
 
-# Display the DataFrame in a full-screen mode
+# Display the tracking table one page at a time; filtering, sorting and paging run in the database
 st.header("Tracking Table")
-st.dataframe(st.session_state.df, use_container_width=True)
+status_counts = letters.count_by('Status')
+for column, (status, count) in zip(st.columns(max(len(status_counts), 1)), status_counts.items()):
+    column.metric(status, count)
 
-# Export data to CSV
+filter_cols = st.columns(4)
+status_filter = filter_cols[0].multiselect("Status", TRACKER_CATEGORIES['Status'])
+bureau_filter = filter_cols[1].multiselect("Credit Bureau", TRACKER_CATEGORIES['Credit Bureau'])
+priority_filter = filter_cols[2].multiselect("Priority", TRACKER_CATEGORIES['Priority'])
+date_range = filter_cols[3].date_input("Date Sent Between", value=[])
+filters = {'Status': status_filter, 'Credit Bureau': bureau_filter, 'Priority': priority_filter}
+date_from, date_to = date_range if len(date_range) == 2 else (None, None)
+
+sort_cols = st.columns(4)
+sort_by = sort_cols[0].selectbox("Sort By", ['Date Sent', 'Client Name', 'Status', 'Priority', 'Credit Bureau', 'Dispute Type'])
+ascending = sort_cols[1].radio("Order", ["Descending", "Ascending"], horizontal=True) == "Ascending"
+page_size = sort_cols[2].selectbox("Rows per Page", [25, 50, 100], index=1)
+total_letters = letters.count(filters, date_from, date_to)
+total_pages = max((total_letters + page_size - 1) // page_size, 1)
+page_number = sort_cols[3].number_input("Page", min_value=1, max_value=total_pages, value=1, step=1)
+
+page_df = letters.page(filters, date_from, date_to, sort_by, ascending, page_size, page_number)
+page_df['Response Due'] = response_deadlines(page_df)
+st.dataframe(page_df, use_container_width=True)
+st.caption(f"Page {page_number} of {total_pages} · {total_letters} matching letters")
+
+# Bureau response deadlines, looked up through the deadline index instead of scanning every letter
+st.header("Response Deadlines")
+today = date.today()
+week_end = today + timedelta(days=6)
+deadline_cols = st.columns(2)
+deadline_cols[0].metric("Overdue", letters.count_due(end=today - timedelta(days=1)))
+deadline_cols[1].metric("Due in the Next 7 Days", letters.count_due(today, week_end))
+st.subheader("Due This Week")
+st.dataframe(letters.due_between(today, week_end, limit=page_size), use_container_width=True)
+with st.expander("Oldest Overdue Letters"):
+    st.dataframe(letters.due_between(end=today - timedelta(days=1), limit=page_size), use_container_width=True)
+
+# Export the filtered letters; built only on request rather than on every rerun
 st.header("Export Data")
-csv = st.session_state.df.to_csv(index=False)
-st.download_button(label="Download as CSV", data=csv, file_name='credit_dispute_tracking.csv', mime='text/csv')
+export_format = st.selectbox("Export Format", list(EXPORT_FORMATS))
+if st.button("Prepare Export"):
+    st.download_button(label="Download", **export_download(letters.frame(filters, date_from, date_to), 'credit_dispute_tracking', export_format))
 
-# Import data from CSV
+# Import data from CSV; streamed in chunks, validated row by row and merged into the stored letters
 st.header("Import Data")
+import_mode = st.radio(
+    "Import Mode", IMPORT_MODES, horizontal=True, format_func=str.title,
+    help="Merge updates letters with the same client, subject and date sent and adds the rest.",
+)
 uploaded_file = st.file_uploader("Choose a CSV file", type="csv")
-if uploaded_file:
-    df = pd.read_csv(uploaded_file)
-    st.session_state.df = df
-    st.success("Data imported successfully!")
-
-# Display the DataFrame again after possible changes
-st.header("Current Data Overview")
-st.dataframe(st.session_state.df, use_container_width=True)
-
+if uploaded_file and st.button("Import Letters"):
+    try:
+        report = letters.import_csv(uploaded_file, import_mode)
+    except ValueError as error:
+        st.error(f"Import failed: {error}")
+    else:
+        rate = report.rows_read / report.seconds if report.seconds else 0
+        st.success(
+            f"Imported {report.inserted} new and {report.updated} updated letters "
+            f"from {report.rows_read} rows in {report.seconds:.1f}s ({rate:,.0f} rows/s)."
+        )
+        if report.error_count:
+            st.warning(f"{report.error_count} values were rejected; those rows were skipped.")
+            st.dataframe(report.errors, use_container_width=True)
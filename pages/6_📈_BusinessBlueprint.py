@@ -1,9 +1,11 @@
 import streamlit as st
 import pandas as pd
-import os
-import uuid
 from datetime import datetime
-import json
+from project_store import (
+    get_project_store, age_bucket, projects_from_templates, ProgressRow, ConflictError, AGE_BUCKETS, DEFAULT_OWNER,
+    PRIORITIES,
+)
+from project_templates import BUSINESS_TEMPLATES
 
 # Initialize Streamlit app
 st.set_page_config(page_title="Business Blueprint 101", layout="wide")
@@ -14,154 +16,52 @@ if "authenticated" not in st.session_state or not st.session_state.authenticated
     st.error("You need to log in to access this page.")
     st.stop()
     
-# Function to load data
-def load_data():
-    if os.path.exists("business_blueprint_data.json"):
-        with open("business_blueprint_data.json", "r") as f:
-            return json.load(f)
-    return {"ID": [], "Title": [], "Steps": [], "Completed": [], "Priority": [], "Created": [], "LastUpdated": []}
-
-# Function to save data
-def save_data(data):
-    with open("business_blueprint_data.json", "w") as f:
-        json.dump(data, f)
+# Shared blueprint store; each change below writes only the rows it touches
+store = get_project_store()
+
+# Projects are kept per user
+owner = st.session_state.get("username") or DEFAULT_OWNER
+
+# Function to apply a store change to the project as displayed. Saves other
+# sessions made meanwhile are merged in; if both changed the same thing, the
+# latest version is shown instead.
+def apply_change(change, *args):
+    try:
+        change(owner, *args)
+    except ConflictError as error:
+        st.warning(f"{error}. Showing the latest version.")
 
 # Function to add new title and steps
-def add_title_steps(data, title, steps):
-    data["ID"].append(str(uuid.uuid4()))
-    data["Title"].append(title)
-    data["Steps"].append(steps)
-    data["Completed"].append([False] * len(steps))
-    data["Priority"].append("Medium")
-    data["Created"].append(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-    data["LastUpdated"].append(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-    save_data(data)
-    return data
-
-# Function to update completion status
-def update_completion(data, id, step_index, status):
-    entry_index = data["ID"].index(id)
-    data["Completed"][entry_index][step_index] = status
-    data["LastUpdated"][entry_index] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    save_data(data)
-    return data
+def add_title_steps(title, steps):
+    return store.create_project(owner, title, steps)
+
+# Function to update completion status from the step's checkbox
+def update_completion(base, step_index):
+    apply_change(store.set_step, base, step_index, st.session_state[f"{base.id}-{base.version}-{step_index}"])
 
 # Function to update priority
-def update_priority(data, id, new_priority):
-    entry_index = data["ID"].index(id)
-    data["Priority"][entry_index] = new_priority
-    data["LastUpdated"][entry_index] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    save_data(data)
-    return data
+def update_priority(base, new_priority):
+    apply_change(store.set_priority, base, new_priority)
 
 # Function to edit title and steps
-def edit_title_steps(data, id, updated_title, updated_steps):
-    entry_index = data["ID"].index(id)
-    data["Title"][entry_index] = updated_title
-    data["Steps"][entry_index] = updated_steps
-    data["Completed"][entry_index] = [False] * len(updated_steps)
-    data["LastUpdated"][entry_index] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    save_data(data)
-    return data
+def edit_title_steps(base, updated_title, updated_steps):
+    apply_change(store.edit_project, base, updated_title, updated_steps)
 
 # Function to delete entry
-def delete_entry(data, id):
-    entry_index = data["ID"].index(id)
-    for key in data.keys():
-        data[key].pop(entry_index)
-    save_data(data)
-    return data
-
-# Function to add example projects
-def add_example_projects(data):
-    example_projects = [
-        {
-            "Title": "Develop Marketing Strategy",
-            "Steps": [
-                "Identify target audience.",
-                "Analyze market trends and competitors.",
-                "Create a unique value proposition.",
-                "Design marketing materials.",
-                "Set up online and offline marketing channels.",
-                "Develop a social media strategy.",
-                "Create a content marketing plan.",
-                "Allocate marketing budget.",
-                "Measure marketing effectiveness.",
-                "Adjust strategy based on performance."
-            ]
-        },
-        {
-            "Title": "Build Online Presence",
-            "Steps": [
-                "Design and launch a business website.",
-                "Set up social media profiles.",
-                "Create a content calendar.",
-                "Engage with potential customers online.",
-                "Optimize your website for search engines.",
-                "Develop a blog or news section.",
-                "Implement an email marketing strategy.",
-                "Run online advertising campaigns.",
-                "Monitor website traffic and engagement.",
-                "Update content regularly."
-            ]
-        },
-        {
-            "Title": "Implement Customer Feedback System",
-            "Steps": [
-                "Create a feedback collection system.",
-                "Design customer surveys.",
-                "Analyze customer feedback data.",
-                "Implement feedback-driven changes.",
-                "Communicate changes to customers.",
-                "Train staff on feedback handling.",
-                "Monitor feedback trends.",
-                "Adjust strategies based on feedback.",
-                "Track improvements and results.",
-                "Regularly update the feedback system."
-            ]
-        },
-        {
-            "Title": "Optimize Operational Efficiency",
-            "Steps": [
-                "Conduct a process audit.",
-                "Identify bottlenecks and inefficiencies.",
-                "Implement process improvements.",
-                "Automate repetitive tasks.",
-                "Enhance team communication.",
-                "Improve resource allocation.",
-                "Monitor process performance.",
-                "Adjust strategies for efficiency.",
-                "Provide staff training.",
-                "Regularly review and refine processes."
-            ]
-        },
-        {
-            "Title": "Expand Market Reach",
-            "Steps": [
-                "Research new market opportunities.",
-                "Develop a market entry strategy.",
-                "Identify key partnerships and alliances.",
-                "Create localized marketing campaigns.",
-                "Adapt products or services for new markets.",
-                "Establish distribution channels.",
-                "Monitor market response and feedback.",
-                "Adjust strategies as needed.",
-                "Scale operations to meet demand.",
-                "Evaluate market expansion success."
-            ]
-        }
-    ]
-
-    for project in example_projects:
-        data = add_title_steps(data, project["Title"], project["Steps"])
-    return data
-
-# Load data
-data = load_data()
+def delete_entry(base):
+    apply_change(store.delete_project, base.id, base.version)
+
+# Function to add example projects; they reference the shared template catalog
+# and store no step text of their own until edited
+def add_example_projects():
+    store.seed_projects(owner, projects_from_templates(BUSINESS_TEMPLATES))
+
+# Projects saved before per-user storage are copied to each user once
+store.claim_legacy(owner)
 
 # Add example projects if not already present
-if not data["ID"]:
-    data = add_example_projects(data)
+if not store.count(owner):
+    add_example_projects()
 
 # Title and Subheader
 st.title("Business Blueprint 101")
@@ -170,41 +70,60 @@ st.subheader("From Start Up to Funding")
 # Display current date
 st.markdown(f"**Completed on {datetime.now().strftime('%B %d, %Y')}**")
 
+# Project browser: one page of titles is listed, and widgets are built only for the selected project
+project_count = store.count(owner)
+page_size = st.sidebar.selectbox("Projects per Page", [10, 25, 50])
+total_pages = max((project_count + page_size - 1) // page_size, 1)
+page_number = st.sidebar.number_input("Page", min_value=1, max_value=total_pages, value=1, step=1)
+st.sidebar.caption(f"{project_count} projects")
+summaries = {
+    summary.id: summary for summary in store.summaries(owner, page_size, (page_number - 1) * page_size)
+}
+
+list_col, detail_col = st.columns([1, 2])
+with list_col:
+    selected_id = st.radio(
+        "Projects", list(summaries),
+        format_func=lambda id: f"{summaries[id].title} ({summaries[id].completed}/{summaries[id].steps})",
+    )
+
 # Main content
-for index, entry_data in enumerate(zip(data["ID"], data["Title"], data["Steps"], data["Completed"], data["Priority"], data["Created"], data["LastUpdated"])):
-    id, title, steps, completed, priority, created, last_updated = entry_data
-    
-    with st.expander(f"{title} (Priority: {priority})", expanded=False):
-        st.write(f"Created: {created}")
-        st.write(f"Last Updated: {last_updated}")
+project = store.get(owner, selected_id) if selected_id else None
+if project is not None:
+    with detail_col:
+        id, title, steps, completed, priority = project.id, project.title, project.steps, project.completed, project.priority
+        st.markdown(f"### {title} (Priority: {priority})")
+        st.write(f"Created: {project.created}")
+        st.write(f"Last Updated: {project.last_updated}")
         
+        # Keys carry the version, so a save by another session shows up as fresh checkboxes
         for step_index, (step, is_completed) in enumerate(zip(steps, completed)):
             col1, col2 = st.columns([0.9, 0.1])
             with col1:
-                if st.checkbox(step, value=is_completed, key=f"{id}-{step_index}", 
-                            on_change=lambda id=id, step_index=step_index: update_completion(data, id, step_index, not is_completed)):
-                    st.experimental_rerun()
+                st.checkbox(step, value=is_completed, key=f"{id}-{project.version}-{step_index}",
+                            on_change=update_completion, args=(project, step_index))
             with col2:
                 st.markdown(f"{'✅' if is_completed else '❌'}")
         
         # Priority dropdown
-        new_priority = st.selectbox("Priority", options=["Low", "Medium", "High"], 
-                                    index=["Low", "Medium", "High"].index(priority), key=f"priority-{id}")
+        new_priority = st.selectbox("Priority", options=PRIORITIES, 
+                                    index=PRIORITIES.index(priority), key=f"priority-{id}")
         if st.button("Update Priority", key=f"update_priority-{id}"):
-            data = update_priority(data, id, new_priority)
+            update_priority(project, new_priority)
             st.experimental_rerun()
         
         # Edit functionality
-        if st.button("Edit", key=f"edit-{id}"):
-            updated_title = st.text_input("Title", value=title)
-            updated_steps = st.text_area("Steps (one per line)", value="\n".join(steps), height=300)
-            if st.button("Save Changes", key=f"save-{id}"):
-                data = edit_title_steps(data, id, updated_title, updated_steps.split("\n"))
-                st.experimental_rerun()
+        with st.expander("Edit", expanded=False):
+            with st.form(key=f"edit-{id}"):
+                updated_title = st.text_input("Title", value=title)
+                updated_steps = st.text_area("Steps (one per line)", value="\n".join(steps), height=300)
+                if st.form_submit_button("Save Changes"):
+                    edit_title_steps(project, updated_title, updated_steps.split("\n"))
+                    st.experimental_rerun()
         
         # Delete functionality
         if st.button("Delete", key=f"delete-{id}"):
-            data = delete_entry(data, id)
+            delete_entry(project)
             st.experimental_rerun()
 
 # Add new title and steps
@@ -212,12 +131,24 @@ with st.expander("Add New Title and Steps", expanded=False):
     new_title = st.text_input("New Title")
     new_steps = st.text_area("Steps (one per line)", height=300)
     if st.button("Add Title and Steps"):
-        data = add_title_steps(data, new_title, new_steps.split("\n"))
+        add_title_steps(new_title, new_steps.split("\n"))
         st.experimental_rerun()
 
-# Summary of tasks
-completed_tasks = sum([sum(completed) for completed in data["Completed"]])
-total_tasks = sum([len(steps) for steps in data["Steps"]])
+# Bulk import and export of the user's projects as JSON
+with st.expander("Import / Export", expanded=False):
+    if st.button("Prepare Export"):
+        st.download_button("Download Projects", data=store.export_projects(owner),
+                           file_name="business_blueprint.json", mime="application/json")
+    uploaded_file = st.file_uploader("Import Projects", type=["json"])
+    if uploaded_file is not None and st.button("Import"):
+        try:
+            st.success(f"Imported {store.import_projects(owner, uploaded_file)} projects.")
+        except (ValueError, KeyError, TypeError) as error:
+            st.error(f"Could not import the file: {error}")
+
+# Summary of tasks, read from the counters the store maintains on every change
+progress = pd.DataFrame(store.progress(owner), columns=ProgressRow._fields)
+total_tasks, completed_tasks = int(progress["steps"].sum()), int(progress["completed"].sum())
 
 st.markdown("## Summary")
 st.markdown(f"**Total tasks:** {total_tasks}")
@@ -227,5 +158,20 @@ st.markdown(f"**Pending tasks:** {total_tasks - completed_tasks}")
 # Progress bar
 st.progress(completed_tasks / total_tasks if total_tasks > 0 else 0)
 
-st.write("### Business Blueprint 101 - Organized and ready to go!")
+# Progress breakdowns by priority and by project age
+today = datetime.now().date()
+progress["age"] = [age_bucket(month, today) for month in progress["created_month"]]
+breakdown_cols = st.columns(2)
+for column, (group, label, order) in zip(breakdown_cols, [
+    ("priority", "Priority", ["High", "Medium", "Low"]),
+    ("age", "Project Age", [bucket for bucket, _ in AGE_BUCKETS]),
+]):
+    breakdown = progress.groupby(group)[["projects", "steps", "completed"]].sum().reindex(order).dropna()
+    breakdown["progress"] = breakdown["completed"] / breakdown["steps"].where(breakdown["steps"] > 0)
+    column.markdown(f"### Progress by {label}")
+    column.dataframe(
+        breakdown.rename_axis(label).rename(columns=str.title).astype({"Projects": int, "Steps": int, "Completed": int}),
+        use_container_width=True,
+    )
 
+st.write("### Business Blueprint 101 - Organized and ready to go!")
@@ -1,9 +1,19 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import logging
+from calculators import calculate_portfolio_schedule
+from exports import export_download, EXPORT_FORMATS
+from calculator_cache import (
+    credit_card_schedule,
+    credit_card_csv,
+    credit_card_chart,
+    amortization_schedule,
+    amortization_csv,
+    amortization_chart,
+    minimum_payment,
+    cache_stats,
+)
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -15,107 +25,13 @@ if "authenticated" not in st.session_state or not st.session_state.authenticated
     st.error("You need to log in to access this page.")
     st.stop()
     
-# Function to calculate total amount payable for a credit card
-def calculate_total_payment(balance, annual_rate, months):
-    logger.info("Calculating total payment for credit card")
-    monthly_rate = annual_rate / 100 / 12
-    total_payment = balance * (1 + monthly_rate) ** months
-    return total_payment
-
-# Function to calculate the full payment schedule for a credit card
-def calculate_credit_card_schedule(balance, annual_rate, months):
-    logger.info("Calculating credit card payment schedule")
-    monthly_rate = annual_rate / 100 / 12
-    monthly_payment = (balance * monthly_rate) / (1 - (1 + monthly_rate) ** -months)
-    
-    schedule = []
-    total_payment = 0
-    total_interest = 0
-    cumulative_interest = 0
-    cumulative_principal = 0
-
-    for i in range(1, months + 1):
-        interest_payment = balance * monthly_rate
-        principal_payment = monthly_payment - interest_payment
-        balance -= principal_payment
-        total_payment += monthly_payment
-        cumulative_interest += interest_payment
-        cumulative_principal += principal_payment
-        total_interest += interest_payment
-        schedule.append({
-            "Month": i,
-            "Payment": monthly_payment,
-            "Principal Payment": principal_payment,
-            "Interest Payment": interest_payment,
-            "Cumulative Interest": cumulative_interest,
-            "Cumulative Principal": cumulative_principal,
-            "Remaining Balance": max(balance, 0)
-        })
-        if balance <= 0:
-            break
-
-    df_schedule = pd.DataFrame(schedule)
-    return df_schedule, total_payment, total_interest
-
-# Function to calculate minimum credit card payment
-def calculate_minimum_payment(balance, annual_rate, minimum_percentage):
-    logger.info("Calculating minimum payment for credit card")
-    monthly_rate = annual_rate / 100 / 12
-    minimum_payment = balance * (minimum_percentage / 100)
-    total_payment = 0
-    months = 0
-    while balance > 0:
-        interest = balance * monthly_rate
-        balance = balance + interest - minimum_payment
-        total_payment += minimum_payment
-        months += 1
-        if balance < 0:
-            total_payment += balance
-            balance = 0
-    return total_payment, months
-
-# Function to calculate amortization schedule with down payment
-def calculate_amortization_schedule(principal, annual_rate, months, down_payment):
-    logger.info("Calculating amortization schedule")
-    # Adjust principal for down payment
-    loan_amount = principal - down_payment
-    monthly_rate = annual_rate / 100 / 12
-    monthly_payment = (loan_amount * monthly_rate) / (1 - (1 + monthly_rate) ** -months)
-    
-    schedule = []
-    total_payment = 0
-    cumulative_interest = 0
-    cumulative_principal = 0
-
-    for i in range(1, months + 1):
-        interest_payment = loan_amount * monthly_rate
-        principal_payment = monthly_payment - interest_payment
-        loan_amount -= principal_payment
-        total_payment += monthly_payment
-        cumulative_interest += interest_payment
-        cumulative_principal += principal_payment
-        schedule.append({
-            "Month": i,
-            "Payment": monthly_payment,
-            "Principal Payment": principal_payment,
-            "Interest Payment": interest_payment,
-            "Cumulative Interest": cumulative_interest,
-            "Cumulative Principal": cumulative_principal,
-            "Remaining Balance": max(loan_amount, 0)
-        })
-        if loan_amount <= 0:
-            break
-
-    df_schedule = pd.DataFrame(schedule)
-    return df_schedule
-
 # Streamlit UI
 st.title("Comprehensive Financial Calculators")
 
 # Sidebar for selecting calculator
 calculator_type = st.sidebar.selectbox(
     "Choose Calculator",
-    ["Credit Card Calculator", "Amortization Calculator", "Credit Card Minimum Payment Calculator"]
+    ["Credit Card Calculator", "Amortization Calculator", "Credit Card Minimum Payment Calculator", "Portfolio Amortization Calculator"]
 )
 
 # Credit Card Calculator
@@ -131,37 +47,19 @@ if calculator_type == "Credit Card Calculator":
     if st.button("Calculate Payment Schedule"):
         if balance > 0 and annual_rate >= 0 and months > 0:
             try:
-                schedule_df, total_payment, total_interest = calculate_credit_card_schedule(balance, annual_rate, months)
+                schedule_df, total_payment, total_interest = credit_card_schedule(balance, annual_rate, months)
                 st.write("Payment Schedule")
                 st.dataframe(schedule_df)
                 st.success(f"The total amount payable is ${total_payment:,.2f}")
                 st.info(f"Total interest paid over the term is ${total_interest:,.2f}")
 
                 # Visualize Payment Schedule
-                fig, ax = plt.subplots(2, 1, figsize=(12, 10))
-                
-                # Principal vs Interest Payment
-                sns.lineplot(data=schedule_df, x="Month", y="Principal Payment", ax=ax[0], label='Principal Payment', color='blue')
-                sns.lineplot(data=schedule_df, x="Month", y="Interest Payment", ax=ax[0], label='Interest Payment', color='red')
-                ax[0].set_xlabel('Month')
-                ax[0].set_ylabel('Payment ($)')
-                ax[0].set_title('Principal and Interest Payment Breakdown')
-                ax[0].legend()
-
-                # Remaining Balance and Cumulative Interest
-                ax[1].plot(schedule_df["Month"], schedule_df["Remaining Balance"], label='Remaining Balance', color='green')
-                ax[1].plot(schedule_df["Month"], schedule_df["Cumulative Interest"], label='Cumulative Interest', color='orange')
-                ax[1].set_xlabel('Month')
-                ax[1].set_ylabel('Amount ($)')
-                ax[1].set_title('Remaining Balance and Cumulative Interest Over Time')
-                ax[1].legend()
-
-                st.pyplot(fig)
+                st.plotly_chart(credit_card_chart(balance, annual_rate, months), use_container_width=True)
 
                 # Export Option
                 st.download_button(
                     label="Download Payment Schedule as CSV",
-                    data=schedule_df.to_csv(index=False).encode('utf-8'),
+                    data=credit_card_csv(balance, annual_rate, months),
                     file_name='credit_card_payment_schedule.csv',
                     mime='text/csv'
                 )
@@ -187,7 +85,7 @@ elif calculator_type == "Amortization Calculator":
     if st.button("Calculate Amortization Schedule"):
         if principal > 0 and annual_rate >= 0 and months > 0:
             try:
-                schedule_df = calculate_amortization_schedule(principal, annual_rate, months, down_payment)
+                schedule_df = amortization_schedule(principal, annual_rate, months, down_payment)
                 st.write("Amortization Schedule")
                 st.dataframe(schedule_df)
 
@@ -196,28 +94,12 @@ elif calculator_type == "Amortization Calculator":
                 st.success(f"The total amount payable over the term is ${total_payment:,.2f}")
 
                 # Visualize Amortization Schedule
-                fig, ax = plt.subplots(2, 1, figsize=(10, 8))
-                
-                # Principal vs Interest Payment
-                sns.lineplot(data=schedule_df, x="Month", y="Principal Payment", ax=ax[0], label='Principal Payment', color='blue')
-                sns.lineplot(data=schedule_df, x="Month", y="Interest Payment", ax=ax[0], label='Interest Payment', color='red')
-                ax[0].set_xlabel('Month')
-                ax[0].set_ylabel('Payment ($)')
-                ax[0].set_title('Principal and Interest Payment Breakdown')
-                ax[0].legend()
-
-                # Remaining Balance
-                sns.lineplot(data=schedule_df, x="Month", y="Remaining Balance", ax=ax[1], color='green')
-                ax[1].set_xlabel('Month')
-                ax[1].set_ylabel('Remaining Balance ($)')
-                ax[1].set_title('Remaining Balance Over Time')
-
-                st.pyplot(fig)
+                st.plotly_chart(amortization_chart(principal, annual_rate, months, down_payment), use_container_width=True)
 
                 # Export Option
                 st.download_button(
                     label="Download Amortization Schedule as CSV",
-                    data=schedule_df.to_csv(index=False).encode('utf-8'),
+                    data=amortization_csv(principal, annual_rate, months, down_payment),
                     file_name='amortization_schedule.csv',
                     mime='text/csv'
                 )
@@ -237,13 +119,20 @@ elif calculator_type == "Credit Card Minimum Payment Calculator":
     balance = st.number_input("Credit Card Balance ($)", min_value=0.0, step=100.0)
     annual_rate = st.number_input("Annual Interest Rate (%)", min_value=0.0, step=0.1)
     min_percentage = st.number_input("Minimum Payment Percentage (%)", min_value=0.0, step=0.1)
+    min_mode = st.radio("Minimum Payment Mode", ["Fixed (percent of starting balance)", "Percent of current balance"])
+    percent_of_balance = min_mode == "Percent of current balance"
+    min_floor = st.number_input("Minimum Payment Floor ($)", min_value=0.0, value=25.0, step=5.0) if percent_of_balance else 0.0
 
     # Calculate button
     if st.button("Calculate Minimum Payment"):
         if balance > 0 and annual_rate >= 0 and min_percentage > 0:
             try:
-                total_payment, months = calculate_minimum_payment(balance, annual_rate, min_percentage)
-                st.success(f"Total payment amount to pay off the balance is ${total_payment:,.2f} over {months} months.")
+                result = minimum_payment(balance, annual_rate, min_percentage, percent_of_balance, min_floor)
+                if result.pays_off:
+                    st.success(f"Total payment amount to pay off the balance is ${result.total_payment:,.2f} over {result.months} months.")
+                    st.info(f"Total interest paid is ${result.total_interest:,.2f}")
+                else:
+                    st.warning("At this minimum payment the balance never pays off: the payment does not cover the monthly interest.")
             except Exception as e:
                 logger.error("Error calculating minimum payment", exc_info=True)
                 st.error("An error occurred while calculating the minimum payment.")
@@ -251,3 +140,38 @@ elif calculator_type == "Credit Card Minimum Payment Calculator":
             st.error("Please enter valid inputs. Balance and percentage must be greater than 0.")
 
     st.write("This calculator estimates the total amount you'll pay and the duration required to pay off your credit card balance based on the minimum payment percentage.")
+
+# Portfolio Amortization Calculator
+elif calculator_type == "Portfolio Amortization Calculator":
+    st.header("Portfolio Amortization Calculator")
+
+    # Input fields
+    uploaded_loans = st.file_uploader("Upload Loans CSV (Loan ID, Principal, Down Payment, Annual Rate, Months)", type="csv")
+    portfolio_export_format = st.selectbox("Export Format", list(EXPORT_FORMATS), index=1)
+
+    # Calculate button
+    if uploaded_loans and st.button("Calculate Portfolio Schedule"):
+        try:
+            loans_df = pd.read_csv(uploaded_loans)
+            schedule_df, totals_df = calculate_portfolio_schedule(loans_df)
+            st.write("Per-Loan Totals")
+            st.dataframe(totals_df)
+            st.success(f"The total amount payable across {len(totals_df)} loans is ${totals_df['Total Payment'].sum():,.2f}")
+            st.info(f"Total interest paid across the portfolio is ${totals_df['Total Interest'].sum():,.2f}")
+
+            # Export Option; large books are written in chunks, gzipped by default
+            st.download_button(
+                label="Download Portfolio Schedule",
+                **export_download(schedule_df, 'portfolio_amortization_schedule', portfolio_export_format)
+            )
+        except Exception as e:
+            logger.error("Error calculating portfolio schedule", exc_info=True)
+            st.error("An error occurred while calculating the portfolio schedule. Check that the CSV has Principal, Annual Rate and Months columns.")
+
+    st.write("This calculator amortizes a whole book of loans at once, with mixed terms, rates and down payments, and exports one combined schedule keyed by Loan ID.")
+
+# Cache statistics for the shared calculator cache
+with st.sidebar.expander("Cache Statistics", expanded=False):
+    stats = cache_stats()
+    st.write(f"Hits: {stats['hits']} | Misses: {stats['misses']} | Hit rate: {stats['hit_rate']:.0%}")
+    st.write(f"Entries: {stats['entries']} | Size: {stats['bytes'] / 1024:,.0f} KB | Evictions: {stats['evictions']}")
@@ -0,0 +1,719 @@
+import ast
+import csv
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from collections import namedtuple
+from datetime import datetime
+
+from project_templates import TEMPLATES
+
+# Database file holding every blueprint project and its steps
+BLUEPRINT_DB_PATH = os.environ.get("BLUEPRINT_DB_PATH", "business_blueprint.db")
+
+# JSON file the blueprint used to rewrite on every change; imported once, then renamed
+LEGACY_BLUEPRINT_PATH = "business_blueprint_data.json"
+
+# Database file holding the credit building projects, and the CSV it replaces
+PROJECTS_DB_PATH = os.environ.get("PROJECTS_DB_PATH", "credit_projects.db")
+LEGACY_PROJECTS_PATH = "credit_projects.csv"
+
+# Owner of projects saved before storage was scoped per user, and of sessions
+# that have no username
+DEFAULT_OWNER = "default"
+
+# Fields of the blueprint's old column layout, a dict of parallel lists
+LEGACY_FIELDS = ["ID", "Title", "Steps", "Completed", "Priority", "Created", "LastUpdated"]
+
+# Priorities a project can have, lowest first
+PRIORITIES = ["Low", "Medium", "High"]
+
+# Attempts a save makes to merge with concurrent saves before giving up
+MAX_SAVE_ATTEMPTS = 20
+
+# One line of a project list: the project's title and priority and its step counts
+ProjectSummary = namedtuple("ProjectSummary", ["id", "title", "priority", "steps", "completed"])
+
+# Maintained counts of an owner's projects and steps for one priority and creation month
+ProgressRow = namedtuple("ProgressRow", ["priority", "created_month", "projects", "steps", "completed"])
+
+# Project age groups for progress breakdowns: (label, projects up to this many months old)
+AGE_BUCKETS = [("This month", 0), ("1-3 months", 3), ("3-12 months", 12), ("Over a year", None)]
+
+_store_lock = threading.Lock()
+_project_stores = {}
+
+
+# Raised when a concurrent save changed the same part of a project, or removed it
+class ConflictError(Exception):
+    pass
+
+
+# Function to format the current time for the Created and Last Updated stamps
+def timestamp():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+# One project: its steps and a completion flag per step. `version`
+# counts saves of the project; 0 means it has not been stored yet.
+# `template_id` names the catalog template the project was seeded from.
+class Project:
+    __slots__ = ("id", "title", "steps", "completed", "priority", "created", "last_updated", "version", "template_id")
+
+    def __init__(self, id, title, steps, completed=None, priority="Medium", created=None, last_updated=None, version=0,
+                 template_id=None):
+        self.id = id
+        self.title = title
+        self.steps = list(steps)
+        self.completed = list(completed) if completed is not None else [False] * len(self.steps)
+        self.priority = priority
+        self.created = created
+        self.last_updated = last_updated if last_updated is not None else created
+        self.version = version
+        self.template_id = template_id
+
+    def copy(self):
+        return Project(
+            self.id, self.title, self.steps, self.completed, self.priority,
+            self.created, self.last_updated, self.version, self.template_id,
+        )
+
+
+# Function to check a project before it is stored
+def check_project(project):
+    if project.priority not in PRIORITIES:
+        raise ValueError(f"{project.priority!r} is not a valid Priority; expected one of {', '.join(PRIORITIES)}")
+    if len(project.completed) != len(project.steps):
+        raise ValueError(f"'{project.title}' has {len(project.steps)} steps but {len(project.completed)} completion flags")
+
+
+# Function to turn catalog templates into new projects that reference them
+def projects_from_templates(templates, priority="Medium"):
+    now = timestamp()
+    return [
+        Project(str(uuid.uuid4()), template.title, template.steps, priority=priority, created=now, template_id=template.id)
+        for template in templates
+    ]
+
+
+# Function to get the step rows stored for a project whose template has
+# `template_steps`. A step still matching its template and not completed gets
+# no row; a row keeps the step's text only where the user changed it.
+def step_rows(project, template_steps):
+    rows = []
+    for index, (text, done) in enumerate(zip(project.steps, project.completed)):
+        if index < len(template_steps) and text == template_steps[index]:
+            text = None
+        if text is not None or done:
+            rows.append((project.id, index, text, int(done)))
+    return rows
+
+
+# Function to rebuild a project's steps and completion flags from its
+# template's steps, its `steps_total` and its stored step rows
+# ({index: (text, completed)}). A step the template cannot supply is left blank
+# rather than failing the whole load.
+def expand_steps(template_steps, steps_total, rows):
+    steps, completed = [], []
+    for index in range(steps_total):
+        text, done = rows.get(index, (None, False))
+        if text is None:
+            text = template_steps[index] if index < len(template_steps) else ""
+        steps.append(text)
+        completed.append(done)
+    return steps, completed
+
+
+# Function to combine our edit of `base` with `theirs`, a newer saved version
+# of the same project, field by field. Step flags merge one step at a time, so
+# two sessions ticking different steps both keep their ticks.
+def merge_project(base, ours, theirs):
+    merged = theirs.copy()
+    for field in ("title", "priority"):
+        mine = getattr(ours, field)
+        if mine != getattr(base, field):
+            if getattr(theirs, field) not in (getattr(base, field), mine):
+                raise ConflictError(f"{field.title()} of '{base.title}' was changed by someone else")
+            setattr(merged, field, mine)
+    if ours.steps != base.steps:
+        if theirs.steps != base.steps:
+            raise ConflictError(f"Steps of '{base.title}' were changed by someone else")
+        merged.steps, merged.completed = list(ours.steps), list(ours.completed)
+    elif ours.completed != base.completed:
+        if theirs.steps != base.steps:
+            raise ConflictError(f"Steps of '{base.title}' were changed by someone else")
+        for index, (before, mine) in enumerate(zip(base.completed, ours.completed)):
+            if mine != before:
+                merged.completed[index] = mine
+    merged.last_updated = ours.last_updated
+    return merged
+
+
+# Function to get the creation month ("YYYY-MM") a project's counters are kept under
+def created_month(created):
+    return (created or "")[:7]
+
+
+# Function to name the AGE_BUCKETS group of a creation month as of `today` (a date)
+def age_bucket(month, today):
+    if not month:
+        return AGE_BUCKETS[-1][0]
+    year, month_number = int(month[:4]), int(month[5:7])
+    age = (today.year - year) * 12 + today.month - month_number
+    for label, max_months in AGE_BUCKETS:
+        if max_months is None or age <= max_months:
+            return label
+
+
+# One owner's projects keyed by id, kept in creation order by the dict itself,
+# so finding, updating and deleting a project never scans the others
+class ProjectBook:
+    def __init__(self, projects=()):
+        self._projects = {project.id: project for project in projects}
+
+    # Function to build a book from the old column layout
+    @classmethod
+    def from_columns(cls, data):
+        return cls(Project(*fields) for fields in zip(*(data[field] for field in LEGACY_FIELDS)))
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path, "r") as f:
+            return cls.from_columns(json.load(f))
+
+    # Function to read the Projects page's old CSV, whose steps were saved as
+    # the text of a Python list
+    @classmethod
+    def from_csv(cls, path):
+        with open(path, "r", newline="") as f:
+            return cls(
+                Project(str(uuid.uuid4()), row["Title"], ast.literal_eval(row["Steps"]) if row["Steps"] else [])
+                for row in csv.DictReader(f)
+            )
+
+    # Function to read exported projects: a JSON list of project records, or
+    # the blueprint's old column layout
+    @classmethod
+    def from_records(cls, records):
+        if isinstance(records, dict):
+            return cls.from_columns(records)
+        return cls(
+            Project(
+                record.get("id") or str(uuid.uuid4()), record["title"], record.get("steps", []), record.get("completed"),
+                record.get("priority", "Medium"), record.get("created"), record.get("last_updated"),
+                template_id=record.get("template_id"),
+            )
+            for record in records
+        )
+
+    # Function to export the book as JSON-ready project records
+    def to_records(self):
+        return [
+            {
+                "id": project.id, "title": project.title, "steps": project.steps, "completed": project.completed,
+                "priority": project.priority, "created": project.created, "last_updated": project.last_updated,
+                "template_id": project.template_id,
+            }
+            for project in self
+        ]
+
+    def __len__(self):
+        return len(self._projects)
+
+    def __iter__(self):
+        return iter(self._projects.values())
+
+    def __contains__(self, project_id):
+        return project_id in self._projects
+
+    def __getitem__(self, project_id):
+        return self._projects[project_id]
+
+    def add(self, project):
+        self._projects[project.id] = project
+        return project
+
+    def remove(self, project_id):
+        return self._projects.pop(project_id)
+
+
+# The project engine behind the Projects and Business Blueprint pages.
+# Projects persisted as SQLite rows, one per project and one per step, scoped
+# by owner. Steps of a project seeded from the template catalog are stored
+# copy-on-write: only the steps a user changed or completed have a row. The
+# store keeps its own copy of each template, written once and never changed,
+# so its projects load the same whatever later happens to the catalog. Each
+# save touches only the rows it changes (ticking a step is a single-row
+# update) and is one transaction. Saves compare-and-swap on the
+# project's version; a save that lost the race is merged into the newer
+# version and retried instead of overwriting it.
+class SQLiteProjectStore:
+    def __init__(self, path=BLUEPRINT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._books = {}
+        self._owner_versions = {}
+        self._cache_lock = threading.Lock()
+        self._templates = {}
+        self._claimed = set()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS projects (id TEXT PRIMARY KEY, owner TEXT NOT NULL, title TEXT, "
+                "priority TEXT, created TEXT, last_updated TEXT, version INTEGER NOT NULL, "
+                "steps_total INTEGER NOT NULL DEFAULT 0, steps_completed INTEGER NOT NULL DEFAULT 0, template_id TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS steps (project_id TEXT, step_index INTEGER, text TEXT, "
+                "completed INTEGER, PRIMARY KEY (project_id, step_index)) WITHOUT ROWID"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS progress (owner TEXT, priority TEXT, created_month TEXT, "
+                "projects INTEGER, steps INTEGER, completed INTEGER, "
+                "PRIMARY KEY (owner, priority, created_month)) WITHOUT ROWID"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS templates (id TEXT PRIMARY KEY, title TEXT, steps TEXT)")
+            conn.execute("CREATE TABLE IF NOT EXISTS legacy_claims (owner TEXT PRIMARY KEY)")
+            conn.executemany(
+                "INSERT OR IGNORE INTO templates (id, title, steps) VALUES (?, ?, ?)",
+                [(template.id, template.title, json.dumps(template.steps)) for template in TEMPLATES.values()],
+            )
+            # Databases created before per-user scoping gain the owner and version columns
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(projects)")}
+            if "owner" not in columns:
+                conn.execute(f"ALTER TABLE projects ADD COLUMN owner TEXT NOT NULL DEFAULT '{DEFAULT_OWNER}'")
+            if "version" not in columns:
+                conn.execute("ALTER TABLE projects ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+            # ... and the step counters, filled in once from the steps themselves
+            if "steps_total" not in columns:
+                conn.execute("ALTER TABLE projects ADD COLUMN steps_total INTEGER NOT NULL DEFAULT 0")
+                conn.execute("ALTER TABLE projects ADD COLUMN steps_completed INTEGER NOT NULL DEFAULT 0")
+                self._rebuild_counters(conn)
+            # ... and the template reference, after which seeded projects drop their copied step text
+            if "template_id" not in columns:
+                conn.execute("ALTER TABLE projects ADD COLUMN template_id TEXT")
+                self._adopt_templates(conn)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_projects_owner ON projects (owner)")
+        self._signature = self._file_signature()
+
+    def _connection(self):
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = conn
+        return conn
+
+    # Function to recount every project's steps and the progress table from
+    # the steps; only valid while every step has a row, before templates
+    def _rebuild_counters(self, conn):
+        conn.execute(
+            "UPDATE projects SET "
+            "steps_total = (SELECT COUNT(*) FROM steps WHERE steps.project_id = projects.id), "
+            "steps_completed = (SELECT COALESCE(SUM(completed), 0) FROM steps WHERE steps.project_id = projects.id)"
+        )
+        conn.execute("DELETE FROM progress")
+        conn.execute(
+            "INSERT INTO progress (owner, priority, created_month, projects, steps, completed) "
+            "SELECT owner, priority, COALESCE(substr(created, 1, 7), ''), COUNT(*), SUM(steps_total), SUM(steps_completed) "
+            "FROM projects GROUP BY 1, 2, 3"
+        )
+
+    # Function to link projects stored with full step text (of `owner`, or of
+    # everyone) to the template they are an unchanged copy of, same title and
+    # same steps, then drop the step text the template now supplies
+    def _adopt_templates(self, conn, owner=None):
+        for template in TEMPLATES.values():
+            sql = "SELECT id FROM projects WHERE template_id IS NULL AND title = ? AND steps_total = ?"
+            params = [template.title, len(template.steps)]
+            if owner is not None:
+                sql += " AND owner = ?"
+                params.append(owner)
+            for project_id, in conn.execute(sql, params).fetchall():
+                texts = conn.execute("SELECT text FROM steps WHERE project_id = ? ORDER BY step_index", (project_id,))
+                if tuple(text for text, in texts) != template.steps:
+                    continue
+                conn.execute("UPDATE projects SET template_id = ? WHERE id = ?", (template.id, project_id))
+                conn.execute("UPDATE steps SET text = NULL WHERE project_id = ?", (project_id,))
+        conn.execute("DELETE FROM steps WHERE text IS NULL AND completed = 0")
+
+    # Function to get this store's copy of a template's steps, or None if the
+    # store has never seen the template
+    def _template_steps(self, template_id):
+        if template_id is None:
+            return None
+        steps = self._templates.get(template_id)
+        if steps is None:
+            row = self._connection().execute("SELECT steps FROM templates WHERE id = ?", (template_id,)).fetchone()
+            if row is not None:
+                steps = self._templates[template_id] = tuple(json.loads(row[0]))
+        return steps
+
+    # Function to add `sign` times a project's counts to the progress row of its priority and month
+    def _count(self, conn, owner, project, sign):
+        conn.execute(
+            "INSERT INTO progress (owner, priority, created_month, projects, steps, completed) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (owner, priority, created_month) DO UPDATE SET projects = projects + excluded.projects, "
+            "steps = steps + excluded.steps, completed = completed + excluded.completed",
+            (owner, project.priority, created_month(project.created), sign, sign * len(project.steps), sign * sum(project.completed)),
+        )
+
+    # Function to fingerprint the database and its write-ahead log; changes
+    # when anything, in this process or another, writes to the store
+    def _file_signature(self):
+        signature = []
+        for path in (self.path, f"{self.path}-wal"):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    # Function to drop an owner's cached projects after this process wrote
+    # them. `signature` is the file signature taken before the write: if it
+    # already differs from the cached one, another process wrote meanwhile and
+    # every owner's cached projects are dropped, not only this owner's.
+    def _written(self, owner, signature):
+        with self._cache_lock:
+            self._owner_versions[owner] = self._owner_versions.get(owner, 0) + 1
+            if signature != self._signature:
+                self._books.clear()
+            else:
+                self._books.pop(owner, None)
+            self._signature = self._file_signature()
+
+    # Function to get an owner's projects from a per-process cache, reading
+    # the database only when the owner's projects were written since, or the
+    # files changed under another process. The book is shared by every
+    # session: copy a project before editing it.
+    def cached_load(self, owner):
+        signature = self._file_signature()
+        with self._cache_lock:
+            if signature != self._signature:
+                self._books.clear()
+                self._signature = signature
+            book = self._books.get(owner)
+            version = self._owner_versions.get(owner, 0)
+        if book is not None:
+            return book
+        book = self.load(owner)
+        with self._cache_lock:
+            # Not cached if a write landed while loading; the next call reloads
+            if self._owner_versions.get(owner, 0) == version and self._signature == signature:
+                self._books[owner] = book
+        return book
+
+    # Function to count an owner's projects from the maintained progress counters
+    def count(self, owner):
+        return self._connection().execute(
+            "SELECT COALESCE(SUM(projects), 0) FROM progress WHERE owner = ?", (owner,)
+        ).fetchone()[0]
+
+    # Function to list one page of an owner's projects, in creation order,
+    # without reading their step text
+    def summaries(self, owner, limit, offset=0):
+        rows = self._connection().execute(
+            "SELECT id, title, priority, steps_total, steps_completed FROM projects WHERE owner = ? "
+            "ORDER BY rowid LIMIT ? OFFSET ?",
+            (owner, limit, offset),
+        )
+        return [ProjectSummary(*row) for row in rows]
+
+    # Function to read an owner's maintained progress counters, one row per
+    # priority and creation month; a handful of rows however many projects there are
+    def progress(self, owner):
+        rows = self._connection().execute(
+            "SELECT priority, created_month, projects, steps, completed FROM progress "
+            "WHERE owner = ? AND projects > 0 ORDER BY priority, created_month",
+            (owner,),
+        )
+        return [ProgressRow(*row) for row in rows]
+
+    # Function to read stored step rows as {project id: {index: (text, completed)}}
+    def _steps(self, conn, owner, project_id=None):
+        sql = (
+            "SELECT steps.project_id, steps.step_index, steps.text, steps.completed FROM steps "
+            "JOIN projects ON projects.id = steps.project_id WHERE projects.owner = ?"
+        )
+        params = [owner]
+        if project_id is not None:
+            sql += " AND projects.id = ?"
+            params.append(project_id)
+        steps = {}
+        for step_project_id, index, text, completed in conn.execute(sql, params):
+            steps.setdefault(step_project_id, {})[index] = (text, bool(completed))
+        return steps
+
+    def _projects(self, conn, owner, steps, project_id=None):
+        sql = (
+            "SELECT id, title, priority, created, last_updated, version, template_id, steps_total "
+            "FROM projects WHERE owner = ?"
+        )
+        params = [owner]
+        if project_id is not None:
+            sql += " AND id = ?"
+            params.append(project_id)
+        return [
+            Project(
+                row_id, title, *expand_steps(self._template_steps(template_id) or (), steps_total, steps.get(row_id, {})),
+                priority, created, last_updated, version, template_id,
+            )
+            for row_id, title, priority, created, last_updated, version, template_id, steps_total
+            in conn.execute(sql + " ORDER BY rowid", params)
+        ]
+
+    # Function to read every project of `owner`, in creation order
+    def load(self, owner):
+        conn = self._connection()
+        # One read transaction, so the projects and their steps come from the same version
+        with conn:
+            conn.execute("BEGIN")
+            return ProjectBook(self._projects(conn, owner, self._steps(conn, owner)))
+
+    # Function to read one project of `owner`, or None if there is none
+    def get(self, owner, project_id):
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN")
+            projects = self._projects(conn, owner, self._steps(conn, owner, project_id), project_id)
+        return projects[0] if projects else None
+
+    def _insert_steps(self, conn, project):
+        conn.executemany(
+            "INSERT INTO steps (project_id, step_index, text, completed) VALUES (?, ?, ?, ?)",
+            step_rows(project, self._template_steps(project.template_id) or ()),
+        )
+
+    def _insert(self, conn, owner, project):
+        # A template the store has no copy of cannot supply step text, so such projects keep all of theirs
+        if self._template_steps(project.template_id) is None:
+            project.template_id = None
+        conn.execute(
+            "INSERT INTO projects (id, owner, title, priority, created, last_updated, version, steps_total, "
+            "steps_completed, template_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                project.id, owner, project.title, project.priority, project.created, project.last_updated,
+                project.version, len(project.steps), sum(project.completed), project.template_id,
+            ),
+        )
+        self._insert_steps(conn, project)
+        self._count(conn, owner, project, 1)
+
+    # Function to store a new project for `owner`; returns it at version 1
+    def add_project(self, owner, project):
+        check_project(project)
+        project = project.copy()
+        project.version = 1
+        signature = self._file_signature()
+        conn = self._connection()
+        with conn:
+            self._insert(conn, owner, project)
+        self._written(owner, signature)
+        return project
+
+    # Function to store `projects` for `owner` only if the owner has none yet,
+    # checked and written in one transaction so concurrent sessions seed once
+    def seed_projects(self, owner, projects):
+        signature = self._file_signature()
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("SELECT 1 FROM projects WHERE owner = ? LIMIT 1", (owner,)).fetchone():
+                return False
+            for project in projects:
+                project = project.copy()
+                project.version = 1
+                self._insert(conn, owner, project)
+        self._written(owner, signature)
+        return True
+
+    # Function to store many new projects for `owner` in one transaction.
+    # Projects whose id is already taken are given a new one.
+    def add_many(self, owner, projects):
+        signature = self._file_signature()
+        conn = self._connection()
+        added = []
+        with conn:
+            for project in projects:
+                check_project(project)
+                project = project.copy()
+                if conn.execute("SELECT 1 FROM projects WHERE id = ?", (project.id,)).fetchone():
+                    project.id = str(uuid.uuid4())
+                project.version = 1
+                self._insert(conn, owner, project)
+                added.append(project)
+        self._written(owner, signature)
+        return added
+
+    # Function to create a project for `owner` from a title and steps
+    def create_project(self, owner, title, steps, priority="Medium"):
+        return self.add_project(owner, Project(str(uuid.uuid4()), title, steps, priority=priority, created=timestamp()))
+
+    # Function to tick or untick one step of `base`, the project as displayed
+    def set_step(self, owner, base, step_index, completed):
+        project = base.copy()
+        project.completed[step_index] = completed
+        project.last_updated = timestamp()
+        return self.save(owner, project, base)
+
+    def set_priority(self, owner, base, priority):
+        project = base.copy()
+        project.priority = priority
+        project.last_updated = timestamp()
+        return self.save(owner, project, base)
+
+    # Function to replace the title and steps of `base`; completion starts over
+    def edit_project(self, owner, base, title, steps):
+        project = base.copy()
+        project.title = title
+        project.steps = list(steps)
+        project.completed = [False] * len(project.steps)
+        project.last_updated = timestamp()
+        return self.save(owner, project, base)
+
+    # Function to export an owner's projects as JSON bytes for download
+    def export_projects(self, owner):
+        return json.dumps(self.cached_load(owner).to_records(), indent=2).encode("utf-8")
+
+    # Function to import exported projects (or an old blueprint file) into an
+    # owner's projects in one transaction; returns how many were added
+    def import_projects(self, owner, source):
+        book = ProjectBook.from_records(json.load(source))
+        return len(self.add_many(owner, book))
+
+    # Function to write `project` over `base`, the version this session read,
+    # if `base` is still the stored version. Returns False if another save got there first.
+    def _swap(self, owner, base, project):
+        conn = self._connection()
+        with conn:
+            swapped = conn.execute(
+                "UPDATE projects SET title = ?, priority = ?, last_updated = ?, version = version + 1, "
+                "steps_total = ?, steps_completed = ? WHERE id = ? AND owner = ? AND version = ?",
+                (
+                    project.title, project.priority, project.last_updated, len(project.steps), sum(project.completed),
+                    project.id, owner, base.version,
+                ),
+            ).rowcount
+            if not swapped:
+                return False
+            # `base` is the stored version, so moving its counts out and ours in is exact
+            self._count(conn, owner, base, -1)
+            self._count(conn, owner, project, 1)
+            if project.steps != base.steps:
+                conn.execute("DELETE FROM steps WHERE project_id = ?", (project.id,))
+                self._insert_steps(conn, project)
+            else:
+                changed = [
+                    (project.id, index, int(done))
+                    for index, (before, done) in enumerate(zip(base.completed, project.completed)) if done != before
+                ]
+                conn.executemany(
+                    "INSERT INTO steps (project_id, step_index, text, completed) VALUES (?, ?, NULL, ?) "
+                    "ON CONFLICT (project_id, step_index) DO UPDATE SET completed = excluded.completed",
+                    changed,
+                )
+                # An unticked step that still has its template text needs no row
+                if any(not done for _, _, done in changed):
+                    conn.execute("DELETE FROM steps WHERE project_id = ? AND text IS NULL AND completed = 0", (project.id,))
+        return True
+
+    # Function to save our edit of `base` (the project as this session read
+    # it) for `owner`. If someone saved the project meanwhile, the edit is
+    # merged into their version and retried. Returns the project as saved.
+    def save(self, owner, project, base):
+        for _ in range(MAX_SAVE_ATTEMPTS):
+            signature = self._file_signature()
+            if self._swap(owner, base, project):
+                self._written(owner, signature)
+                saved = project.copy()
+                saved.version = base.version + 1
+                return saved
+            current = self.get(owner, project.id)
+            if current is None:
+                raise ConflictError(f"'{base.title}' was deleted by someone else")
+            project, base = merge_project(base, project, current), current
+        raise ConflictError(f"'{base.title}' is being changed too often to save; try again")
+
+    # Function to delete a project of `owner` if nobody changed it since `version`
+    def delete_project(self, owner, project_id, version):
+        signature = self._file_signature()
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT priority, created, steps_total, steps_completed FROM projects WHERE id = ? AND owner = ? AND version = ?",
+                (project_id, owner, version),
+            ).fetchone()
+            if row is not None:
+                priority, created, steps_total, steps_completed = row
+                conn.execute(
+                    "UPDATE progress SET projects = projects - 1, steps = steps - ?, completed = completed - ? "
+                    "WHERE owner = ? AND priority = ? AND created_month = ?",
+                    (steps_total, steps_completed, owner, priority, created_month(created)),
+                )
+                conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+                conn.execute("DELETE FROM steps WHERE project_id = ?", (project_id,))
+        if row is not None:
+            self._written(owner, signature)
+        if row is None and self.get(owner, project_id) is not None:
+            raise ConflictError("The project was changed by someone else; review it before deleting")
+
+    # Function to import a page's old JSON or CSV file for the default owner in
+    # one transaction. The file is renamed afterwards so it is never imported
+    # twice; signed-in users get their copy through claim_legacy.
+    def import_legacy(self, path):
+        if not os.path.exists(path):
+            return 0
+        book = ProjectBook.from_csv(path) if path.endswith(".csv") else ProjectBook.from_json(path)
+        signature = self._file_signature()
+        conn = self._connection()
+        with conn:
+            for project in book:
+                if conn.execute("SELECT 1 FROM projects WHERE id = ?", (project.id,)).fetchone():
+                    continue
+                project.version = 1
+                self._insert(conn, DEFAULT_OWNER, project)
+            # Old files hold full copies of the example projects; link them to the catalog instead
+            self._adopt_templates(conn, DEFAULT_OWNER)
+        self._written(DEFAULT_OWNER, signature)
+        os.replace(path, f"{path}.migrated")
+        return len(book)
+
+    # Function to give `owner` a copy of the default owner's projects: those
+    # imported from the pages' old files, or stored before per-user scoping,
+    # which every user used to share. Copied once per owner, in one
+    # transaction; returns the number of projects copied.
+    def claim_legacy(self, owner):
+        if owner == DEFAULT_OWNER or owner in self._claimed:
+            return 0
+        signature = self._file_signature()
+        conn = self._connection()
+        copied = []
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("INSERT OR IGNORE INTO legacy_claims (owner) VALUES (?)", (owner,)).rowcount:
+                copied = self._projects(conn, DEFAULT_OWNER, self._steps(conn, DEFAULT_OWNER))
+                for project in copied:
+                    project.id = str(uuid.uuid4())
+                    project.version = 1
+                    self._insert(conn, owner, project)
+        self._claimed.add(owner)
+        if copied:
+            self._written(owner, signature)
+        return len(copied)
+
+
+# Function to get the process-wide store kept at `path`, importing the page's
+# old file from `legacy_path` on first use
+def get_project_store(path=BLUEPRINT_DB_PATH, legacy_path=LEGACY_BLUEPRINT_PATH):
+    with _store_lock:
+        store = _project_stores.get(path)
+        if store is None:
+            store = SQLiteProjectStore(path)
+            store.import_legacy(legacy_path)
+            _project_stores[path] = store
+    return store
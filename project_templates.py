@@ -0,0 +1,215 @@
+from collections import namedtuple
+from types import MappingProxyType
+
+# A read-only project template. Projects seeded from a template keep its id
+# and store a step's text only once the user changes it.
+#
+# The catalog is append-only. An id ("name@version") is published once and
+# never edited or removed: to reword, reorder or shorten a template, add it
+# again under the next version. Each project store also keeps its own copy of
+# every template it has used, so projects still load if the catalog changes.
+ProjectTemplate = namedtuple("ProjectTemplate", ["id", "title", "steps"])
+
+# Templates the Projects page starts each user with
+CREDIT_TEMPLATES = (
+    ProjectTemplate("review-credit-report@1", "Review Credit Report", (
+        "Obtain a copy of your credit report from all three bureaus.",
+        "Check for errors or inaccuracies.",
+        "Dispute any inaccuracies with the credit bureaus.",
+        "Review your credit history for trends.",
+        "Understand your current credit score.",
+        "Identify areas for improvement.",
+        "Analyze any negative items impacting your score.",
+        "Request updates or corrections to your credit history.",
+        "Track changes to your credit report over time.",
+        "Set goals for improving your credit score.",
+    )),
+    ProjectTemplate("pay-bills-on-time@1", "Pay Bills on Time", (
+        "Create a budget to manage expenses.",
+        "Set up automatic payments or reminders.",
+        "Prioritize paying bills before due dates.",
+        "Monitor accounts regularly for missed payments.",
+        "Adjust your budget as needed to ensure timely payments.",
+        "Consider using a bill payment app for better tracking.",
+        "Review your payment history for accuracy.",
+        "Set up alerts for upcoming due dates.",
+        "Plan for unexpected expenses to avoid late payments.",
+        "Evaluate your payment methods and choose the most efficient ones.",
+    )),
+    ProjectTemplate("reduce-credit-card-balances@1", "Reduce Credit Card Balances", (
+        "List all credit card debts and their interest rates.",
+        "Create a debt repayment plan.",
+        "Focus on paying down high-interest cards first.",
+        "Consider balance transfers to lower interest rates.",
+        "Avoid adding new charges to paid-off cards.",
+        "Make more than the minimum payment whenever possible.",
+        "Set up a payment schedule to reduce balances gradually.",
+        "Monitor your credit utilization ratio regularly.",
+        "Seek advice on effective debt reduction strategies.",
+        "Review and adjust your plan as needed.",
+    )),
+    ProjectTemplate("increase-credit-limit@1", "Increase Credit Limit", (
+        "Contact your credit card issuer to request a limit increase.",
+        "Provide financial information if requested.",
+        "Maintain a good payment history before requesting.",
+        "Use the increased limit responsibly.",
+        "Monitor your credit utilization ratio with the new limit.",
+        "Evaluate the impact of the limit increase on your credit score.",
+        "Consider setting spending limits on your cards.",
+        "Review your credit report for changes.",
+        "Adjust your budget to reflect the new credit limit.",
+        "Continue to manage your credit card balances effectively.",
+    )),
+    ProjectTemplate("open-a-secured-credit-card@1", "Open a Secured Credit Card", (
+        "Research secured credit cards with favorable terms.",
+        "Apply for a secured card and deposit the required amount.",
+        "Use the card for small purchases and pay off balances in full.",
+        "Track your credit score for improvements.",
+        "Consider transitioning to an unsecured card over time.",
+        "Monitor the terms of the secured card for changes.",
+        "Review your credit report to see the impact of the new card.",
+        "Set up automatic payments to avoid missed payments.",
+        "Evaluate other credit-building options.",
+        "Plan for the transition from a secured to unsecured card.",
+    )),
+    ProjectTemplate("establish-credit-history@1", "Establish Credit History", (
+        "Apply for credit with a retailer or bank.",
+        "Use the credit responsibly and make timely payments.",
+        "Consider becoming an authorized user on someone else's account.",
+        "Avoid applying for too much credit at once.",
+        "Monitor your credit report regularly.",
+        "Review your credit history for completeness.",
+        "Maintain a positive credit utilization ratio.",
+        "Set goals for credit account management.",
+        "Evaluate the impact of new credit accounts on your score.",
+        "Seek professional advice if needed.",
+    )),
+    ProjectTemplate("monitor-credit-regularly@1", "Monitor Credit Regularly", (
+        "Sign up for a credit monitoring service.",
+        "Set up alerts for any changes in your credit report.",
+        "Review credit reports at least once a year.",
+        "Address any issues or changes promptly.",
+        "Track your credit score trends over time.",
+        "Compare your credit score with industry benchmarks.",
+        "Evaluate the effectiveness of your credit-building strategies.",
+        "Update your credit monitoring service as needed.",
+        "Review the terms of your monitoring service.",
+        "Seek help if you notice any suspicious activity.",
+    )),
+    ProjectTemplate("negotiate-with-creditors@1", "Negotiate with Creditors", (
+        "Identify accounts with high interest rates or fees.",
+        "Contact creditors to negotiate better terms.",
+        "Request lower interest rates or fee waivers.",
+        "Document all agreements and changes.",
+        "Follow up to ensure agreements are honored.",
+        "Review your credit card statements for updated terms.",
+        "Evaluate the impact of negotiated terms on your credit score.",
+        "Set reminders to review and renegotiate terms if needed.",
+        "Consider consolidating debts if beneficial.",
+        "Seek professional assistance if negotiations are unsuccessful.",
+    )),
+    ProjectTemplate("build-a-positive-credit-mix@1", "Build a Positive Credit Mix", (
+        "Maintain a mix of credit accounts (revolving and installment).",
+        "Avoid closing old accounts, as they contribute to credit history length.",
+        "Manage each type of credit responsibly.",
+        "Monitor the impact of your credit mix on your score.",
+        "Adjust your credit strategy to maintain a healthy mix.",
+        "Consider diversifying your credit portfolio strategically.",
+        "Review your credit mix regularly for balance.",
+        "Set goals for maintaining a positive credit mix.",
+        "Seek advice on managing different types of credit accounts.",
+        "Evaluate the effects of new credit accounts on your mix.",
+    )),
+    ProjectTemplate("avoid-new-hard-inquiries@1", "Avoid New Hard Inquiries", (
+        "Limit the number of credit applications.",
+        "Apply for credit only when necessary.",
+        "Research credit options before applying.",
+        "Monitor your credit report for hard inquiries.",
+        "Understand the impact of hard inquiries on your score.",
+        "Avoid multiple credit applications within a short period.",
+        "Set goals for managing credit inquiries.",
+        "Review the terms of each credit application before applying.",
+        "Evaluate the benefits versus risks of new credit applications.",
+        "Seek alternatives to traditional credit applications if needed.",
+    )),
+    ProjectTemplate("create-a-credit-improvement-plan@1", "Create a Credit Improvement Plan", (
+        "Set clear credit goals and objectives.",
+        "Develop a step-by-step action plan.",
+        "Track progress and adjust strategies as needed.",
+        "Seek professional advice if necessary.",
+        "Review and revise the plan regularly.",
+        "Set up milestones to measure progress.",
+        "Monitor the impact of each action on your credit score.",
+        "Adjust your plan based on feedback and results.",
+        "Stay informed about credit management best practices.",
+        "Celebrate achievements and plan for future improvements.",
+    )),
+)
+
+# Templates the Business Blueprint page starts each user with
+BUSINESS_TEMPLATES = (
+    ProjectTemplate("develop-marketing-strategy@1", "Develop Marketing Strategy", (
+        "Identify target audience.",
+        "Analyze market trends and competitors.",
+        "Create a unique value proposition.",
+        "Design marketing materials.",
+        "Set up online and offline marketing channels.",
+        "Develop a social media strategy.",
+        "Create a content marketing plan.",
+        "Allocate marketing budget.",
+        "Measure marketing effectiveness.",
+        "Adjust strategy based on performance.",
+    )),
+    ProjectTemplate("build-online-presence@1", "Build Online Presence", (
+        "Design and launch a business website.",
+        "Set up social media profiles.",
+        "Create a content calendar.",
+        "Engage with potential customers online.",
+        "Optimize your website for search engines.",
+        "Develop a blog or news section.",
+        "Implement an email marketing strategy.",
+        "Run online advertising campaigns.",
+        "Monitor website traffic and engagement.",
+        "Update content regularly.",
+    )),
+    ProjectTemplate("implement-customer-feedback-system@1", "Implement Customer Feedback System", (
+        "Create a feedback collection system.",
+        "Design customer surveys.",
+        "Analyze customer feedback data.",
+        "Implement feedback-driven changes.",
+        "Communicate changes to customers.",
+        "Train staff on feedback handling.",
+        "Monitor feedback trends.",
+        "Adjust strategies based on feedback.",
+        "Track improvements and results.",
+        "Regularly update the feedback system.",
+    )),
+    ProjectTemplate("optimize-operational-efficiency@1", "Optimize Operational Efficiency", (
+        "Conduct a process audit.",
+        "Identify bottlenecks and inefficiencies.",
+        "Implement process improvements.",
+        "Automate repetitive tasks.",
+        "Enhance team communication.",
+        "Improve resource allocation.",
+        "Monitor process performance.",
+        "Adjust strategies for efficiency.",
+        "Provide staff training.",
+        "Regularly review and refine processes.",
+    )),
+    ProjectTemplate("expand-market-reach@1", "Expand Market Reach", (
+        "Research new market opportunities.",
+        "Develop a market entry strategy.",
+        "Identify key partnerships and alliances.",
+        "Create localized marketing campaigns.",
+        "Adapt products or services for new markets.",
+        "Establish distribution channels.",
+        "Monitor market response and feedback.",
+        "Adjust strategies as needed.",
+        "Scale operations to meet demand.",
+        "Evaluate market expansion success.",
+    )),
+)
+
+# Every template by id; built once per process and shared by every session
+TEMPLATES = MappingProxyType({template.id: template for template in CREDIT_TEMPLATES + BUSINESS_TEMPLATES})
+
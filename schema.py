@@ -0,0 +1,42 @@
+import pandas as pd
+
+# Allowed values of the dispute tracker's enumerated columns, in display order
+TRACKER_CATEGORIES = {
+    'Status': ['Sent', 'In Review', 'Resolved', 'Pending'],
+    'Dispute Type': ['Credit Report', 'Identity Theft', 'Fraudulent Account', 'Incorrect Info', 'Duplicate Account'],
+    'Credit Bureau': ['Experian', 'TransUnion', 'Equifax'],
+    'Priority': ['High', 'Medium', 'Low'],
+}
+
+# Allowed values of the credit dashboard's enumerated columns, in display order
+CREDIT_CATEGORIES = {
+    'Payment History': ['On Time', 'Late'],
+    'Credit Report Summary': ['Excellent', 'Good', 'Average', 'Poor'],
+    'Credit Account Type': ['Credit Card', 'Loan', 'Mortgage', 'Auto Loan'],
+}
+
+# Fixed categorical dtypes for those columns. Each value is stored as a small
+# integer code into one shared list of categories instead of a Python string.
+TRACKER_DTYPES = {column: pd.CategoricalDtype(values) for column, values in TRACKER_CATEGORIES.items()}
+CREDIT_DTYPES = {column: pd.CategoricalDtype(values) for column, values in CREDIT_CATEGORIES.items()}
+
+
+# Function to give the enumerated columns present in `df` their fixed
+# categorical dtype; values outside the categories become missing
+def with_categories(df, dtypes):
+    changes = {
+        column: df[column].astype(dtype) for column, dtype in dtypes.items()
+        if column in df.columns and df[column].dtype != dtype
+    }
+    return df.assign(**changes) if changes else df
+
+
+# Function to check edited values of enumerated columns before they are
+# written; missing values are allowed
+def check_categories(values, dtypes):
+    for column, value in values.items():
+        dtype = dtypes.get(column)
+        if dtype is None or value is None or (not isinstance(value, str) and pd.isna(value)):
+            continue
+        if value not in dtype.categories:
+            raise ValueError(f"{value!r} is not a valid {column}; expected one of {', '.join(dtype.categories)}")
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from calculators import (
+    NEVER_PAYS_OFF,
+    calculate_amortization_schedule,
+    calculate_credit_card_schedule,
+    calculate_minimum_payment,
+    calculate_portfolio_schedule,
+)
+
+
+# Function to build a schedule with the month-by-month loop the closed-form
+# engine replaced
+def loop_schedule(balance, annual_rate, months):
+    monthly_rate = annual_rate / 100 / 12
+    monthly_payment = (balance * monthly_rate) / (1 - (1 + monthly_rate) ** -months)
+    schedule = []
+    cumulative_interest = 0
+    cumulative_principal = 0
+    for i in range(1, months + 1):
+        interest_payment = balance * monthly_rate
+        principal_payment = monthly_payment - interest_payment
+        balance -= principal_payment
+        cumulative_interest += interest_payment
+        cumulative_principal += principal_payment
+        schedule.append({
+            "Month": i,
+            "Payment": monthly_payment,
+            "Principal Payment": principal_payment,
+            "Interest Payment": interest_payment,
+            "Cumulative Interest": cumulative_interest,
+            "Cumulative Principal": cumulative_principal,
+            "Remaining Balance": max(balance, 0),
+        })
+        if balance <= 0:
+            break
+    return pd.DataFrame(schedule)
+
+
+# Function to simulate a minimum-payment payoff one month at a time: each
+# month pays the larger of the percentage (of the starting balance, or of the
+# current balance) and the floor, and the last month pays what is left.
+# Returns (months, total paid), or None if the balance stops shrinking.
+def simulate_payoff(balance, annual_rate, percentage, percent_of_balance, floor, max_months=100_000):
+    monthly_rate = annual_rate / 100 / 12
+    fixed = balance * percentage / 100
+    total = 0.0
+    for month in range(1, max_months + 1):
+        payment = max(balance * percentage / 100 if percent_of_balance else fixed, floor)
+        owed = balance * (1 + monthly_rate)
+        if payment >= owed - 1e-9:
+            return month, total + owed
+        if owed - payment >= balance:
+            return None
+        total += payment
+        balance = owed - payment
+    return None
+
+
+@pytest.mark.parametrize("balance", [1.0, 1234.56, 25_000.0, 1_000_000.0])
+@pytest.mark.parametrize("annual_rate", [0.1, 5.0, 18.99, 29.9])
+@pytest.mark.parametrize("months", [1, 12, 60, 360, 480])
+def test_schedules_match_the_loop_to_the_cent(balance, annual_rate, months):
+    expected = loop_schedule(balance, annual_rate, months)
+    schedule, total_payment, total_interest = calculate_credit_card_schedule(balance, annual_rate, months)
+    assert list(schedule.columns) == list(expected.columns)
+    assert len(schedule) == len(expected)
+    assert np.abs(schedule.to_numpy() - expected.to_numpy()).max() < 0.005
+    assert total_payment == pytest.approx(expected["Payment"].sum(), abs=0.005)
+    assert total_interest == pytest.approx(expected["Interest Payment"].sum(), abs=0.005)
+
+    amortization = calculate_amortization_schedule(balance + 500, annual_rate, months, 500)
+    assert np.abs(amortization.to_numpy() - expected.to_numpy()).max() < 0.005
+
+
+def test_zero_rate_amortizes_linearly():
+    schedule, total_payment, total_interest = calculate_credit_card_schedule(1200.0, 0.0, 12)
+    assert schedule["Payment"].tolist() == [100.0] * 12
+    assert schedule["Remaining Balance"].iloc[-1] == 0
+    assert (total_payment, total_interest) == (1200.0, 0.0)
+
+
+def test_portfolio_matches_single_loans():
+    loans = pd.DataFrame({
+        "Loan ID": ["a", "b", "c"],
+        "Principal": [10_000.0, 250_000.0, 3_000.0],
+        "Down Payment": [0.0, 50_000.0, 0.0],
+        "Annual Rate": [7.5, 4.25, 0.0],
+        "Months": [36, 360, 12],
+    })
+    schedule, totals = calculate_portfolio_schedule(loans)
+    for loan in loans.to_dict("records"):
+        single = calculate_amortization_schedule(loan["Principal"], loan["Annual Rate"], loan["Months"], loan["Down Payment"])
+        rows = schedule[schedule["Loan ID"] == loan["Loan ID"]].drop(columns="Loan ID").reset_index(drop=True)
+        pd.testing.assert_frame_equal(rows, single)
+    assert totals["Months"].tolist() == [36, 360, 12]
+
+
+def test_minimum_payment_matches_a_simulation():
+    rng = np.random.default_rng(0)
+    for _ in range(3000):
+        balance = float(rng.uniform(100, 50_000))
+        annual_rate = float(rng.uniform(0, 30))
+        percentage = float(rng.uniform(1, 10))
+        percent_of_balance = bool(rng.random() < 0.5)
+        floor = float(rng.uniform(10, 100)) if percent_of_balance else 0.0
+        result = calculate_minimum_payment(balance, annual_rate, percentage, percent_of_balance, floor)
+        simulated = simulate_payoff(balance, annual_rate, percentage, percent_of_balance, floor)
+        if simulated is None:
+            assert result == NEVER_PAYS_OFF
+            continue
+        months, total_payment = simulated
+        assert result.pays_off
+        assert result.months == months
+        assert result.total_payment == pytest.approx(total_payment, abs=0.01)
+        assert result.total_interest == pytest.approx(total_payment - balance, abs=0.01)
+
+
+def test_payment_below_the_interest_never_pays_off():
+    assert calculate_minimum_payment(10_000, 24, 1) == NEVER_PAYS_OFF
+    # A pure percentage of the current balance shrinks it forever without reaching zero
+    assert calculate_minimum_payment(10_000, 12, 3, percent_of_balance=True) == NEVER_PAYS_OFF
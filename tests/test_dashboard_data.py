@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard_data import (
+    AGGREGATE_COLUMNS,
+    SAMPLE_CLIENT,
+    ArrowCreditStore,
+    CreditAggregates,
+    CreditDataView,
+    SortedCreditStore,
+    generate_sample_book,
+)
+from schema import CREDIT_CATEGORIES
+
+
+@pytest.fixture(params=[SortedCreditStore, ArrowCreditStore])
+def store(request, tmp_path):
+    book = generate_sample_book(2)
+    if request.param is SortedCreditStore:
+        return SortedCreditStore.from_frame(book)
+    store = ArrowCreditStore(str(tmp_path / "credit"))
+    for client_id, df in book.groupby("Client ID"):
+        store.write(client_id, df.drop(columns="Client ID"))
+    return store
+
+
+# Function to draw a random edit of one history row, like the Edit Credit Info view makes
+def random_patch(rng):
+    choices = {
+        "Credit Score": lambda: int(rng.integers(300, 851)),
+        "Credit Utilization": lambda: float(rng.uniform(0, 1)),
+        "Payment History": lambda: str(rng.choice(CREDIT_CATEGORIES["Payment History"])),
+        "Credit Report Summary": lambda: str(rng.choice(CREDIT_CATEGORIES["Credit Report Summary"])),
+        "Credit Inquiries": lambda: int(rng.integers(0, 10)),
+        "Loan Balances": lambda: int(rng.integers(1000, 20000)),
+        "Recent Transactions": lambda: int(rng.integers(0, 20)),
+        "Total Debt": lambda: int(rng.integers(1000, 20000)),
+        "Income": lambda: int(rng.integers(3000, 10000)),
+    }
+    columns = rng.choice(list(choices), size=int(rng.integers(1, 4)), replace=False)
+    return {column: choices[column]() for column in columns}
+
+
+# Function to compare one aggregate with its rebuilt value, floats to a tolerance
+def assert_same(actual, expected):
+    if isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    elif isinstance(expected, pd.Series):
+        assert {key: pytest.approx(value) for key, value in expected.items()} == dict(actual.items())
+    else:
+        assert actual == pytest.approx(expected, nan_ok=True)
+
+
+def test_patched_aggregates_match_a_rebuild(store):
+    view = CreditDataView(store, SAMPLE_CLIENT)
+    aggregates = view.aggregates()
+    rows = len(view.frame(["Date"]))
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        index = int(rng.integers(0, rows))
+        view.apply_patch(index, random_patch(rng))
+        # The edit was folded into the shared aggregates, not rebuilt from scratch
+        assert view.aggregates() is aggregates
+        expected = CreditAggregates(store.read(SAMPLE_CLIENT, AGGREGATE_COLUMNS))
+        for key, value in expected.values.items():
+            assert_same(aggregates[key], value)
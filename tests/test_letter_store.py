@@ -0,0 +1,172 @@
+import io
+import threading
+
+import pandas as pd
+import pytest
+
+from letter_store import TRACKER_COLUMNS, SQLiteLetterStore, response_deadlines
+from schema import TRACKER_CATEGORIES
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteLetterStore(str(tmp_path / "letters.db"))
+
+
+# Function to build a valid letter record
+def letter(client_name, date_sent, **values):
+    record = {column: "" for column in TRACKER_COLUMNS}
+    record.update({
+        'Client Name': client_name,
+        'Letter Subject': "Dispute",
+        'Date Sent': date_sent,
+        'Status': "Sent",
+        'Dispute Type': "Credit Report",
+        'Credit Bureau': "Experian",
+        'Priority': "Medium",
+    })
+    record.update(values)
+    return record
+
+
+# Function to write letter records as the CSV text an advisor would upload
+def letters_csv(*records):
+    return io.StringIO(pd.DataFrame(list(records), columns=TRACKER_COLUMNS).to_csv(index=False))
+
+
+@pytest.mark.parametrize("column", ['Priority', 'Status'])
+def test_enumerated_columns_sort_in_display_order(store, column):
+    values = TRACKER_CATEGORIES[column]
+    # Inserted in reverse alphabetical order, so neither insertion nor text order matches
+    store.append_many(
+        letter(f"Client {index}", f"2024-01-{index + 1:02d}", **{column: value})
+        for index, value in enumerate(sorted(values, reverse=True))
+    )
+    ascending = store.page(sort_by=column, ascending=True)[column].tolist()
+    descending = store.page(sort_by=column, ascending=False)[column].tolist()
+    assert ascending == values
+    assert descending == values[::-1]
+
+
+def test_concurrent_writers_lose_no_letters(store):
+    writers, letters_each = 8, 200
+    barrier = threading.Barrier(writers + 2)
+    errors = []
+    done = threading.Event()
+
+    def write(writer):
+        try:
+            barrier.wait()
+            for index in range(letters_each):
+                store.append(letter(f"Writer {writer}", "2024-01-01", **{'Letter Subject': f"Letter {index}"}))
+        except Exception as error:
+            errors.append(error)
+
+    def read():
+        try:
+            barrier.wait()
+            while not done.is_set():
+                store.count_by('Status')
+                store.page(page_size=20)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=write, args=(writer,)) for writer in range(writers)]
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    for thread in threads + readers:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    done.set()
+    for thread in readers:
+        thread.join()
+
+    assert errors == []
+    assert store.count() == writers * letters_each
+    assert store.count_by('Client Name').tolist() == [letters_each] * writers
+
+
+def test_import_reports_invalid_rows_and_stores_the_rest(store):
+    report = store.import_csv(letters_csv(
+        letter("Ada", "2024-01-01"),
+        letter("", "2024-01-02"),
+        letter("Bea", "2024-01-03", Status=""),
+        letter("Cy", "2024-01-04", Status="Lost"),
+        letter("Di", "not a date"),
+        letter("Ed", "2024-01-05", Priority="Urgent"),
+        letter("Flo", "2024-01-06", Priority=""),
+    ))
+    assert (report.rows_read, report.inserted, report.updated, report.error_count) == (7, 2, 0, 5)
+    assert report.errors[['Line', 'Column']].values.tolist() == [
+        [3, 'Client Name'], [4, 'Status'], [5, 'Status'], [6, 'Date Sent'], [7, 'Priority'],
+    ]
+    assert store.frame()['Client Name'].tolist() == ["Ada", "Flo"]
+    # Every stored letter has a status, so the per-status summary has only real labels
+    assert store.count_by('Status').to_dict() == {"Sent": 2}
+
+
+def test_import_modes(store):
+    store.append_many([letter("Ada", "2024-01-01"), letter("Bea", "2024-01-02")])
+    update = letter("Ada", "2024-01-01", Status="Resolved")
+    new = letter("Cy", "2024-01-03")
+
+    report = store.import_csv(letters_csv(update, new), "merge")
+    assert (report.inserted, report.updated) == (1, 1)
+    assert store.frame()[['Client Name', 'Status']].astype(str).values.tolist() == [
+        ["Ada", "Resolved"], ["Bea", "Sent"], ["Cy", "Sent"],
+    ]
+
+    report = store.import_csv(letters_csv(update, new), "append")
+    assert (report.inserted, report.updated) == (2, 0)
+    assert store.count() == 5
+
+    report = store.import_csv(letters_csv(update, new), "replace")
+    assert (report.inserted, report.updated) == (2, 0)
+    assert store.frame()['Client Name'].tolist() == ["Ada", "Cy"]
+
+    with pytest.raises(ValueError):
+        store.import_csv(letters_csv(new), "upsert")
+
+
+def test_merge_keeps_the_last_of_duplicate_keys(store):
+    store.append(letter("Ada", "2024-01-01"))
+    # Duplicate keys within a file and across chunks both land on one letter
+    report = store.import_csv(letters_csv(
+        letter("Ada", "2024-01-01", Status="Pending"),
+        letter("Ada", "2024-01-01", Status="In Review"),
+        letter("Bea", "2024-01-02"),
+        letter("Bea", "2024-01-02", Notes="Second"),
+        letter("Ada", "2024-01-01", Status="Resolved"),
+    ), "merge", chunk_rows=2)
+    assert report.error_count == 0
+    df = store.frame()
+    assert df[['Client Name', 'Status']].astype(str).values.tolist() == [["Ada", "Resolved"], ["Bea", "Sent"]]
+    assert df['Notes'].iloc[1] == "Second"
+
+
+def test_deadline_queries_agree_with_response_deadlines(store):
+    statuses = TRACKER_CATEGORIES['Status']
+    store.append_many(
+        letter(f"Client {index}", f"2024-01-{index % 28 + 1:02d}", Status=statuses[index // 28 % len(statuses)])
+        for index in range(200)
+    )
+    df = store.frame()
+    df['Response Due'] = response_deadlines(df)
+    # Resolved letters have no deadline
+    assert df.loc[df['Status'] == 'Resolved', 'Response Due'].isna().all()
+    assert df.loc[df['Status'] != 'Resolved', 'Response Due'].notna().all()
+
+    # Bounds are inclusive: both fall exactly on stored deadlines
+    start, end = pd.Timestamp("2024-02-10"), pd.Timestamp("2024-02-20")
+    assert (df['Response Due'] == start).any() and (df['Response Due'] == end).any()
+    for bounds in [(start, end), (start, None), (None, end), (None, None), (end, end)]:
+        expected = df['Response Due'].notna()
+        if bounds[0] is not None:
+            expected &= df['Response Due'] >= bounds[0]
+        if bounds[1] is not None:
+            expected &= df['Response Due'] <= bounds[1]
+        due = store.due_between(*bounds)
+        assert store.count_due(*bounds) == len(due) == expected.sum()
+        deadlines = due.set_index('Client Name')['Response Due']
+        assert deadlines.to_dict() == df[expected].set_index('Client Name')['Response Due'].to_dict()
+        assert deadlines.is_monotonic_increasing
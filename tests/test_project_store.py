@@ -0,0 +1,233 @@
+import random
+import threading
+from types import MappingProxyType
+
+import pytest
+
+import project_store
+from benchmarks.project_store_benchmark import random_operations, recount_mismatches, seed
+from project_store import DEFAULT_OWNER, ConflictError, Project, SQLiteProjectStore
+from project_templates import CREDIT_TEMPLATES, TEMPLATES, ProjectTemplate
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteProjectStore(str(tmp_path / "projects.db"))
+
+
+# Function to total an owner's maintained step counters
+def step_counts(store, owner):
+    rows = store.progress(owner)
+    return sum(row.steps for row in rows), sum(row.completed for row in rows)
+
+
+# Function to read an owner's projects as plain (title, steps, completed, template) tuples
+def full_text(store, owner):
+    return {project.id: (project.title, project.steps, project.completed, project.template_id) for project in store.load(owner)}
+
+
+def test_concurrent_ticks_on_different_steps_all_survive(store):
+    threads_count, steps_per_thread = 8, 8
+    steps = [f"Step {index}" for index in range(threads_count * steps_per_thread)]
+    stale = store.add_project("alice", Project("p1", "Shared", steps, created="2024-01-01 00:00:00"))
+    barrier = threading.Barrier(threads_count)
+    errors = []
+
+    # Every thread starts from the same version-1 snapshot and ticks its own steps
+    def tick(first):
+        try:
+            base = stale
+            barrier.wait()
+            for index in range(first, first + steps_per_thread):
+                base = store.set_step("alice", base, index, True)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=tick, args=(n * steps_per_thread,)) for n in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    saved = store.get("alice", "p1")
+    assert saved.completed == [True] * len(steps)
+    assert saved.version == 1 + len(steps)
+    assert step_counts(store, "alice") == (len(steps), len(steps))
+
+
+def test_conflicting_title_edits_raise(store):
+    base = store.add_project("alice", Project("p1", "Original", ["a", "b"]))
+    ours, theirs = base.copy(), base.copy()
+    theirs.title = "Theirs"
+    store.save("alice", theirs, base)
+    ours.title = "Ours"
+    with pytest.raises(ConflictError):
+        store.save("alice", ours, base)
+    assert store.get("alice", "p1").title == "Theirs"
+
+
+def test_conflicting_priority_edits_raise(store):
+    base = store.add_project("alice", Project("p1", "Original", ["a", "b"]))
+    store.set_priority("alice", base, "High")
+    with pytest.raises(ConflictError):
+        store.set_priority("alice", base, "Low")
+    assert store.get("alice", "p1").priority == "High"
+
+
+def test_edits_to_different_fields_merge(store):
+    base = store.add_project("alice", Project("p1", "Original", ["a", "b"]))
+    store.set_priority("alice", base, "High")
+    store.set_step("alice", base, 1, True)
+    saved = store.get("alice", "p1")
+    assert (saved.priority, saved.completed, saved.version) == ("High", [False, True], 3)
+
+
+def test_stale_delete_is_refused(store):
+    base = store.add_project("alice", Project("p1", "Original", ["a", "b"]))
+    current = store.set_step("alice", base, 0, True)
+    with pytest.raises(ConflictError):
+        store.delete_project("alice", "p1", base.version)
+    assert store.get("alice", "p1") is not None
+    store.delete_project("alice", "p1", current.version)
+    assert store.get("alice", "p1") is None
+    assert store.count("alice") == 0
+
+
+def test_owners_are_isolated(store):
+    alice = store.add_project("alice", Project("a1", "Alice's", ["a"]))
+    bob = store.add_project("bob", Project("b1", "Bob's", ["b", "c"]))
+
+    assert [project.id for project in store.load("alice")] == ["a1"]
+    assert [summary.id for summary in store.summaries("bob", 10)] == ["b1"]
+    assert store.get("alice", "b1") is None
+    assert (store.count("alice"), store.count("bob")) == (1, 1)
+    assert step_counts(store, "bob") == (2, 0)
+
+    # Alice cannot change or delete Bob's project, even knowing its id and version
+    with pytest.raises(ConflictError):
+        store.set_step("alice", bob, 0, True)
+    store.delete_project("alice", "b1", bob.version)
+    assert store.get("bob", "b1").completed == [False, False]
+    assert store.get("alice", "a1").title == alice.title
+
+
+def test_counters_match_a_recount_after_random_operations(store):
+    seed(store, "alice", 200)
+    random_operations(store, "alice", 1000, random.Random(0))
+    assert recount_mismatches(store, "alice") == []
+    assert store.count("alice") == len(store.load("alice"))
+
+
+def test_cache_sees_another_process_write_before_a_local_write(tmp_path):
+    path = str(tmp_path / "projects.db")
+    a, b = SQLiteProjectStore(path), SQLiteProjectStore(path)
+    a.add_project("y", Project("y1", "First", ["a"]))
+    assert len(a.cached_load("y")) == 1
+
+    # B stands in for another process; A's own write must not hide B's
+    b.add_project("y", Project("y2", "Second", ["b"]))
+    a.add_project("x", Project("x1", "Other owner", ["c"]))
+    assert len(a.cached_load("y")) == 2
+
+
+def test_legacy_projects_are_copied_to_each_owner_once(store, tmp_path):
+    legacy = tmp_path / "projects.csv"
+    legacy.write_text('Title,Steps\nOld plan,"[\'a\', \'b\']"\n')
+    assert store.import_legacy(str(legacy)) == 1
+    assert not legacy.exists()
+
+    assert store.claim_legacy("alice") == 1
+    assert store.claim_legacy("alice") == 0
+    assert store.claim_legacy("bob") == 1
+    [alice], [bob] = store.load("alice"), store.load("bob")
+    assert (alice.title, alice.steps) == ("Old plan", ["a", "b"])
+    assert alice.id != bob.id
+
+    # Each copy is the owner's own: ticks stay with it, and deleting it does not bring it back
+    store.set_step("alice", alice, 0, True)
+    assert store.get("bob", bob.id).completed == [False, False]
+    assert [project.completed for project in store.load(DEFAULT_OWNER)] == [[False, False]]
+    store.delete_project("alice", alice.id, alice.version + 1)
+    assert SQLiteProjectStore(store.path).claim_legacy("alice") == 0
+    assert store.count("alice") == 0
+    assert recount_mismatches(store, "bob") == []
+
+
+def test_template_projects_match_a_full_text_model(store):
+    seed(store, "alice", 30)
+    model = full_text(store, "alice")
+    rng = random.Random(0)
+    for index in range(600):
+        project = store.get("alice", rng.choice(sorted(model)))
+        template = TEMPLATES[project.template_id].steps if project.template_id else ()
+        choice = rng.random()
+        if choice < 0.6 and project.steps:
+            step = rng.randrange(len(project.steps))
+            project = store.set_step("alice", project, step, not project.completed[step])
+        elif choice < 0.9:
+            steps = list(project.steps)
+            if steps and rng.random() < 0.7:
+                step = rng.randrange(len(steps))
+                # Sometimes back to the template's own text, which needs no stored text again
+                steps[step] = template[step] if step < len(template) and rng.random() < 0.4 else f"Edited {index}"
+            else:
+                steps = list(template)[:rng.randint(0, len(template))] + [f"Extra {index}"] * rng.randint(0, 2)
+            project = store.edit_project("alice", project, project.title, steps)
+        else:
+            project = store.set_priority("alice", project, rng.choice(project_store.PRIORITIES))
+        model[project.id] = (project.title, project.steps, project.completed, project.template_id)
+    assert full_text(store, "alice") == model
+    assert full_text(SQLiteProjectStore(store.path), "alice") == model
+
+    # Rows are kept only for changed or completed steps
+    conn = store._connection()
+    assert conn.execute("SELECT COUNT(*) FROM steps WHERE text IS NULL AND completed = 0").fetchone()[0] == 0
+    rows = conn.execute("SELECT COUNT(*) FROM steps").fetchone()[0]
+    assert rows < sum(len(steps) for _, steps, _, _ in model.values())
+    assert recount_mismatches(store, "alice") == []
+
+
+def test_catalog_changes_leave_stored_projects_unchanged(store, monkeypatch):
+    seed(store, "alice", len(CREDIT_TEMPLATES))
+    project = next(iter(store.load("alice")))
+    store.set_step("alice", project, 1, True)
+    before = full_text(store, "alice")
+
+    # Every template reworded and shortened under its published id, which the catalog forbids
+    changed = {
+        template.id: ProjectTemplate(template.id, template.title, tuple(f"Changed {step}" for step in template.steps[:2]))
+        for template in TEMPLATES.values()
+    }
+    monkeypatch.setattr(project_store, "TEMPLATES", MappingProxyType(changed))
+    reopened = SQLiteProjectStore(store.path)
+    assert full_text(reopened, "alice") == before
+    assert recount_mismatches(reopened, "alice") == []
+
+
+def test_adoption_links_only_exact_template_copies(store):
+    template = CREDIT_TEMPLATES[0]
+    steps = list(template.steps)
+    exact = store.add_project("alice", Project("exact", template.title, steps))
+    store.set_step("alice", exact, 2, True)
+    store.add_project("alice", Project("reworded", template.title, steps[:-1] + ["Something else"]))
+    store.add_project("alice", Project("shorter", template.title, steps[:-1]))
+    store.add_project("alice", Project("longer", template.title, steps + ["One more"]))
+    store.add_project("alice", Project("renamed", "My " + template.title, steps))
+    store.add_project("bob", Project("other-owner", template.title, steps))
+    before = full_text(store, "alice")
+
+    with store._connection() as conn:
+        store._adopt_templates(conn, "alice")
+
+    after = full_text(store, "alice")
+    assert {project_id: project[3] for project_id, project in after.items()} == {
+        "exact": template.id, "reworded": None, "shorter": None, "longer": None, "renamed": None,
+    }
+    assert {project_id: project[:3] for project_id, project in after.items()} == {
+        project_id: project[:3] for project_id, project in before.items()
+    }
+    assert full_text(store, "bob")["other-owner"][3] is None
+    # The adopted project keeps a row for its ticked step only
+    rows = store._connection().execute("SELECT step_index, text, completed FROM steps WHERE project_id = 'exact'").fetchall()
+    assert rows == [(2, None, 1)]